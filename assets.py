@@ -0,0 +1,131 @@
+import os
+import glob
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import pygame as pg
+import constant as cs
+
+log = logging.getLogger("GameLogger")
+
+class AssetManager:
+    """
+    Loads every sprite under the sprite folder once and shares it across the process.
+
+    PNGs are decoded in a thread pool, then converted to the display format: images that
+    really use transparency with convert_alpha(), fully opaque ones with the faster convert().
+    Images of each folder are packed into one atlas per format and handed out as subsurfaces.
+    Images are named by their path without extension, e.g. "towers/tower_1".
+    """
+    def __init__(self, root="Sprites", workers=cs.ASSET_LOAD_WORKERS, atlas_width=cs.ATLAS_WIDTH):
+        self.root = root
+        self.workers = workers
+        self.atlas_width = atlas_width
+        self.images = {}      # name -> subsurface of an atlas
+        self.atlases = {}     # (folder, "alpha" or "opaque") -> atlas surface
+        self.load_times = {}  # phase -> milliseconds
+        self.loaded = False
+
+    def load(self):
+        """
+        Decode, convert and pack all sprites. Needs the display mode to be set. Runs only once.
+        """
+        if self.loaded:
+            return
+        self.loaded = True
+        start = time.perf_counter()
+
+        paths = sorted(glob.glob(os.path.join(self.root, "**", "*.png"), recursive=True))
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            decoded = list(pool.map(self.decode, paths))
+        decode_done = time.perf_counter()
+
+        # Group the images by folder and by whether they need per-pixel alpha
+        groups = {}
+        for path, surface in zip(paths, decoded):
+            if surface is None:
+                continue
+            name = os.path.splitext(os.path.relpath(path, self.root))[0].replace(os.sep, "/")
+            folder = os.path.dirname(name)
+            kind = "alpha" if self.uses_transparency(surface) else "opaque"
+            groups.setdefault((folder, kind), []).append((name, surface))
+        for key, images in groups.items():
+            self.pack(key, images)
+        pack_done = time.perf_counter()
+
+        self.load_times = {
+            "decode_ms": (decode_done - start) * 1000,
+            "pack_ms": (pack_done - decode_done) * 1000,
+            "total_ms": (pack_done - start) * 1000,
+        }
+        log.info(f"Loaded {len(self.images)} sprites into {len(self.atlases)} atlases in "
+                 f"{self.load_times['total_ms']:.1f} ms (decode {self.load_times['decode_ms']:.1f} ms, "
+                 f"convert and pack {self.load_times['pack_ms']:.1f} ms)")
+
+    def decode(self, path):
+        """
+        Decode one image file (called on a worker thread). Returns None if it cannot be read.
+        """
+        try:
+            return pg.image.load(path)
+        except (pg.error, OSError) as e:
+            log.error(f"Could not decode {path}: {e}")
+            return None
+
+    @staticmethod
+    def uses_transparency(surface):
+        """
+        Return True if any pixel of the surface is not fully opaque.
+        """
+        if surface.get_colorkey() is not None:
+            return True
+        if not surface.get_flags() & pg.SRCALPHA:
+            return False
+        return pg.surfarray.array_alpha(surface).min() < 255
+
+    def pack(self, key, images):
+        """
+        Pack images into one atlas in rows (shelves) of at most atlas_width pixels.
+        """
+        images.sort(key=lambda item: (-item[1].get_height(), item[0]))
+        positions = []
+        x = y = shelf_height = width = 0
+        for name, surface in images:
+            w, h = surface.get_size()
+            if x and x + w > self.atlas_width:
+                x, y = 0, y + shelf_height  # Start a new shelf
+                shelf_height = 0
+            positions.append((name, surface, pg.Rect(x, y, w, h)))
+            x += w
+            width = max(width, x)
+            shelf_height = max(shelf_height, h)
+
+        if key[1] == "alpha":
+            atlas = pg.Surface((width, y + shelf_height), pg.SRCALPHA).convert_alpha()
+            atlas.fill((0, 0, 0, 0))
+            blend = pg.BLEND_RGBA_MAX  # Copies the pixels and their alpha unchanged onto the empty atlas
+        else:
+            atlas = pg.Surface((width, y + shelf_height)).convert()
+            blend = 0
+        for name, surface, rect in positions:
+            atlas.blit(surface, rect, special_flags=blend)
+            self.images[name] = atlas.subsurface(rect)
+        self.atlases[key] = atlas
+
+    def image(self, name, size=(cs.TILE_SIZE, cs.TILE_SIZE)):
+        """
+        Return the shared image called name. A black placeholder is returned for missing images.
+        Callers must not draw on the returned surface.
+        """
+        self.load()
+        surface = self.images.get(name)
+        if surface is None:
+            log.error(f"Could not load image for {name}")
+            surface = pg.Surface(size)
+            surface.fill((0, 0, 0))
+            self.images[name] = surface
+        return surface
+
+
+# Shared asset manager used by all sprite classes
+assets = AssetManager()
@@ -0,0 +1,191 @@
+"""
+Batch balance runner: plays headless simulations over a grid of stat values,
+maps and turret layouts on all CPU cores and streams one result per run to a file.
+
+Usage (from the project root):
+    python balance_sweep.py sweeps/example_grid.json results.jsonl [--workers N]
+
+The output format follows the file extension (.jsonl or .csv). Runs already present
+in the output file are skipped, so an interrupted sweep continues where it stopped.
+
+Grid file (JSON):
+    {
+        "scenarios": [{"map": "maps/endless_level.txt", "level": 4, "wave": 3}],
+        "layouts": {"corridor": [[4, 3, "tower_1", 2], [9, 3, "tower_2"]]},
+        "params": {
+            "tower_1.damage": [1, 2],     # TURRET_DATA[<tower type>][<stat>]
+            "normal.hp": [10, 15],        # ENEMY_DATA[<enemy type>][<stat>]
+            "spawn.normal": [10, 20]      # ENEMY_SPAWN_DATA count for the scenario's level
+        },
+        "hp": 20, "money": 1000, "max_ticks": 100000
+    }
+Every combination of parameter values is run on every scenario with each of the scenario's
+layouts (all layouts when the scenario does not list any).
+"""
+import argparse
+import copy
+import csv
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+
+import constant as cs
+from enemy_data import ENEMY_DATA, ENEMY_SPAWN_DATA
+from turret_data import TURRET_DATA
+from simulation import run_simulation
+
+RESULT_FIELDS = ["outcome", "leaks", "kills", "money", "hp", "ticks"]
+
+
+def build_jobs(grid):
+    """
+    Expand a grid definition into a list of independent simulation jobs.
+    """
+    params = grid.get("params", {})
+    names = sorted(params)
+    jobs = []
+    for values in itertools.product(*(params[name] for name in names)):
+        overrides = dict(zip(names, values))
+        for scenario in grid["scenarios"]:
+            for layout_name in scenario.get("layouts", grid["layouts"]):
+                job = {
+                    "map": scenario["map"],
+                    "level": scenario.get("level", 1),
+                    "wave": scenario.get("wave", 0),
+                    "layout": layout_name,
+                    "turrets": grid["layouts"][layout_name],
+                    "params": overrides,
+                    "hp": grid.get("hp", cs.HEALTH),
+                    "money": grid.get("money", cs.MONEY),
+                    "max_ticks": grid.get("max_ticks", 100000),
+                }
+                job["job_id"] = job_id(job)
+                jobs.append(job)
+    return jobs
+
+
+def job_id(job):
+    """
+    Stable identifier of a job, used to recognise finished runs when resuming.
+    """
+    key = json.dumps({k: v for k, v in job.items() if k != "job_id"}, sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def apply_overrides(params, level):
+    """
+    Return copies of the turret, enemy and spawn tables with the job's parameter values applied.
+    """
+    turret_data = copy.deepcopy(TURRET_DATA)
+    enemy_data = copy.deepcopy(ENEMY_DATA)
+    spawn_data = copy.deepcopy(ENEMY_SPAWN_DATA)
+
+    for name, value in params.items():
+        owner, stat = name.split(".", 1)
+        if owner == "spawn":
+            spawn_data[level - 1][stat] = value
+        elif owner in turret_data:
+            turret_data[owner][stat] = value
+        elif owner in enemy_data:
+            enemy_data[owner][stat] = value
+        else:
+            raise ValueError(f"Unknown parameter {name}")
+    return turret_data, enemy_data, spawn_data
+
+
+def run_job(job):
+    """
+    Run one headless simulation (executed in a worker process) and return its result row.
+    """
+    turret_data, enemy_data, spawn_data = apply_overrides(job["params"], job["level"])
+    result = run_simulation(
+        job["map"], job["turrets"], level=job["level"], wave=job["wave"], max_ticks=job["max_ticks"],
+        enemy_data=enemy_data, turret_data=turret_data, spawn_data=spawn_data,
+        hp=job["hp"], money=job["money"],
+    )
+    row = {"job_id": job["job_id"], "map": job["map"], "level": job["level"],
+           "wave": job["wave"], "layout": job["layout"]}
+    row.update(job["params"])
+    row.update(result)
+    return row
+
+
+def read_finished(output_path):
+    """
+    Return the ids of jobs already written to the output file. Incomplete trailing
+    lines left by an interrupted run are ignored.
+    """
+    if not os.path.exists(output_path):
+        return set()
+
+    finished = set()
+    with open(output_path, "r", newline="") as f:
+        if output_path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                if row.get("job_id") and row.get(RESULT_FIELDS[-1]):
+                    finished.add(row["job_id"])
+        else:
+            for line in f:
+                try:
+                    finished.add(json.loads(line)["job_id"])
+                except (ValueError, KeyError):
+                    continue
+    return finished
+
+
+def ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def run_sweep(grid, output_path, workers=None):
+    """
+    Run every unfinished job of the grid on a process pool, appending results as they arrive.
+    Returns the number of jobs run.
+    """
+    jobs = build_jobs(grid)
+    finished = read_finished(output_path)
+    pending = [job for job in jobs if job["job_id"] not in finished]
+    print(f"{len(jobs)} jobs, {len(jobs) - len(pending)} already done, {len(pending)} to run")
+    if not pending:
+        return 0
+
+    is_csv = output_path.endswith(".csv")
+    fieldnames = (["job_id", "map", "level", "wave", "layout"]
+                  + sorted(grid.get("params", {})) + RESULT_FIELDS)
+    write_header = is_csv and not finished
+
+    with open(output_path, "a", newline="") as f, multiprocessing.Pool(workers) as pool:
+        if f.tell() and not ends_with_newline(output_path):
+            f.write("\n")  # Terminate a line cut off by an interrupted run
+        writer = csv.DictWriter(f, fieldnames=fieldnames) if is_csv else None
+        if write_header:
+            writer.writeheader()
+        for done, row in enumerate(pool.imap_unordered(run_job, pending), start=1):
+            if is_csv:
+                writer.writerow(row)
+            else:
+                f.write(json.dumps(row) + "\n")
+            f.flush()  # Keep finished results on disk in case the sweep is interrupted
+            if done % 100 == 0 or done == len(pending):
+                print(f"{done}/{len(pending)} jobs finished")
+    return len(pending)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("grid", help="JSON file describing scenarios, layouts and parameter values")
+    parser.add_argument("output", help="result file (.jsonl or .csv), appended to when resuming")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    with open(args.grid, "r") as f:
+        grid = json.load(f)
+    try:
+        run_sweep(grid, args.output, args.workers)
+    except ValueError as e:
+        sys.exit(str(e))
@@ -0,0 +1,2 @@
+# Performance benchmarks for the game logic. Run modules from the project root, e.g.:
+#   python -m benchmarks.targeting_crossover
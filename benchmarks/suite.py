@@ -0,0 +1,294 @@
+"""
+Repeatable performance benchmarks for pathfinding, targeting, movement and rendering.
+
+For every map the suite builds the same scenario: the map's wave (endless wave N on
+the endless map) spread along the path and K turrets of each type on the grass
+tiles closest to the path. It then times:
+- a_star:    a_star_search from start to finish for every enemy type
+- corridor:  MapState.find_path (corridor graph search) for the same routes, graph already built
+- targeting: Turret.find_target plus check_line_of_sight for every turret
+- move:      one Enemy.move for every enemy
+- map_draw:  Map.draw of the tiles inside the camera view
+- frame:     one main loop frame (simulation ticks, draw_game_elements, dirty rect update),
+             measured over the first frames of the wave
+
+Results are printed as a table and can be written as JSON to compare runs across commits.
+
+Usage (from the project root):
+    python -m benchmarks.suite [--wave 10] [--turrets 3] [--repeats 20] [--output run.json]
+    python -m benchmarks.suite --output new.json --compare old.json
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import glob
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import pygame as pg
+
+import constant as cs
+from map_state import MapState
+from map import Map
+from enemies import Enemy
+from turrets import Turret
+from pathfinding import a_star_search
+from simulation import Simulation
+from assets import assets
+from camera import Camera
+
+TOWER_TYPES = ["tower_1", "tower_2", "tower_3"]
+ENEMY_TYPES = ["normal", "heavy", "fast"]
+
+
+def map_level(map_file):
+    """Return the level number a shipped map belongs to (4 for the endless map)."""
+    name = os.path.splitext(os.path.basename(map_file))[0]
+    if name.startswith("level") and name[5:].isdigit():
+        return int(name[5:])
+    return 4
+
+
+def turret_sites(game_map, count):
+    """Return up to count grass tiles ordered by their distance to the enemy path."""
+    walkable = [pos for tile_type in ("path", "marsh", "start", "finish")
+                for pos in game_map.tile_positions[tile_type]]
+
+    def distance(pos):
+        return min(max(abs(pos[0] - x), abs(pos[1] - y)) for x, y in walkable)
+
+    return sorted(game_map.tile_positions["grass"], key=lambda pos: (distance(pos), pos[1], pos[0]))[:count]
+
+
+def build_scenario(map_file, wave, turrets_per_type):
+    """
+    Load a map with its wave queued and turrets placed, ready for the main loop.
+    Returns (game_map, simulation).
+    """
+    game_map = Map()
+    if not game_map.load_from_file(map_file):
+        sys.exit(f"Could not load map {map_file}")
+    game_map.level = map_level(map_file)
+    game_map.hp = 10 ** 6  # The frame benchmark must not end early because enemies get through
+    if game_map.level == 4:
+        for _ in range(wave):
+            game_map.advance_endless_wave()
+    game_map.generate_enemy_list()
+
+    simulation = Simulation(game_map, pg.sprite.Group(), pg.sprite.Group(),
+                            enemy_factory=Enemy, turret_factory=Turret)
+    sites = turret_sites(game_map, turrets_per_type * len(TOWER_TYPES))
+    for index, tile_pos in enumerate(sites):
+        simulation.add_turret(tile_pos, TOWER_TYPES[index % len(TOWER_TYPES)])
+    return game_map, simulation
+
+
+def spread_enemies(game_map, simulation):
+    """Spawn the whole wave at once, spaced evenly along each enemy's path."""
+    count = len(game_map.enemy_list)
+    for index, enemy_type in enumerate(game_map.enemy_list):
+        enemy = Enemy(game_map, enemy_type)
+        if len(enemy.path) >= 3:
+            # Keep every enemy at least one tile before the finish so a move never ends its run
+            path_index = 2 + index * (len(enemy.path) - 3) // max(count, 1)
+            enemy.current_path_index = path_index
+            enemy.current_target = game_map.get_tile_center(enemy.path[path_index - 1])
+            enemy.center = game_map.get_tile_center(enemy.path[path_index - 2])
+            enemy.rect.center = enemy.center
+            game_map.enemy_grid.move(enemy, enemy.center)
+        simulation.enemies.add(enemy)
+
+
+def time_runs(func, repeats, setup=None):
+    """Time repeated single runs of func (calling setup untimed before each) in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def summarize(times):
+    return {"best_ms": min(times), "median_ms": statistics.median(times), "runs": len(times)}
+
+
+def game_camera(game_map):
+    """Camera the game would use for the map, at its default zoom."""
+    world_size = (game_map.width * cs.TILE_SIZE, game_map.height * cs.TILE_SIZE)
+    return Camera((min(world_size[0], cs.VIEW_WIDTH), min(world_size[1], cs.VIEW_HEIGHT)), world_size)
+
+
+def bench_static(map_file, wave, turrets_per_type, repeats, screen):
+    """Benchmarks that work on a frozen snapshot of the scenario."""
+    game_map, simulation = build_scenario(map_file, wave, turrets_per_type)
+    camera = game_camera(game_map)
+    spread_enemies(game_map, simulation)
+    enemies = list(simulation.enemies)
+    turrets = list(simulation.turrets)
+
+    def search_all():
+        for enemy_type in ENEMY_TYPES:
+            a_star_search(game_map, game_map.start_pos, game_map.finish_pos, enemy_type)
+
+    def corridor_all():
+        for enemy_type in ENEMY_TYPES:
+            game_map.find_path(game_map.start_pos, game_map.finish_pos, enemy_type)
+
+    for enemy_type in ENEMY_TYPES:
+        game_map.get_corridor_graph(enemy_type)  # Built once per map, not part of a search
+
+    def target_all():
+        for turret in turrets:
+            target = turret.find_target(simulation.enemies, game_map.enemy_grid)
+            if target:
+                turret.check_line_of_sight(game_map, target)
+
+    # Enemy.move changes enemy state, restore it before every run
+    snapshot = [(enemy, enemy.center, enemy.current_target, enemy.current_path_index) for enemy in enemies]
+
+    def restore_enemies():
+        for enemy, center, target, path_index in snapshot:
+            enemy.center, enemy.current_target, enemy.current_path_index = center, target, path_index
+            game_map.enemy_grid.move(enemy, center)
+
+    def move_all():
+        for enemy in enemies:
+            enemy.move()
+
+    results = {
+        "a_star": summarize(time_runs(search_all, repeats)),
+        "corridor": summarize(time_runs(corridor_all, repeats)),
+        "targeting": summarize(time_runs(target_all, repeats)),
+        "move": summarize(time_runs(move_all, repeats, restore_enemies)),
+        "map_draw": summarize(time_runs(lambda: game_map.draw(screen, camera), repeats)),
+    }
+    return results, len(enemies), len(turrets)
+
+
+def bench_frames(map_file, wave, turrets_per_type, frames, screen, font):
+    """Time full main loop frames from the start of the wave."""
+    import main
+    from buttons import Button
+    from story_and_missions import MissionManager
+
+    main.font = font  # draw_text and the menus read the module level font set by main's entry point
+    game_map, simulation = build_scenario(map_file, wave, turrets_per_type)
+    camera = game_camera(game_map)
+    mission = MissionManager()
+    panel_x = camera.view_width
+    buttons = [
+        Button(panel_x + 75, 60, 200, 50, "Upgrade turret", font),
+        Button(panel_x + 75, 120, 150, 50, "Buy turret", font),
+        Button(panel_x + 75, 300, 150, 50, "Cancel", font),
+        Button(panel_x + 75, 400, 150, 50, "Start wave", font),
+    ]
+    turret_buttons = [
+        Button(panel_x + 25, 180, 100, 40, "Tower 1", font),
+        Button(panel_x + 135, 180, 100, 40, "Tower 2", font),
+        Button(panel_x + 75, 230, 100, 40, "Tower 3", font),
+    ]
+    selected_turret = next(iter(simulation.turrets), None)
+    ticks_per_frame = max(1, round(cs.SIM_TICK_RATE / cs.FPS))
+
+    background = main.build_background(screen, game_map, camera)
+    screen.blit(background, (0, 0))
+    dirty_rects = []
+
+    simulation.start_wave()
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        for rect in dirty_rects:
+            screen.blit(background, rect, rect)
+        for _ in range(ticks_per_frame):
+            simulation.step()
+        drawn_rects = main.draw_game_elements(screen, game_map, camera, simulation.turrets, simulation.enemies,
+                                              mission, font, False, 0, 0, selected_turret, *buttons,
+                                              simulation.wave_active, *turret_buttons)
+        pg.display.update(dirty_rects + drawn_rects)
+        dirty_rects = drawn_rects
+        times.append((time.perf_counter() - start) * 1000)
+        if simulation.wave_finished():
+            break
+    return summarize(times)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(maps, wave, turrets_per_type, repeats, frames):
+    pg.init()
+    font = pg.font.SysFont(None, 36)
+    rows = []
+    for map_file in maps:
+        probe = MapState()  # Only for the window size, Map needs the window to load its images
+        probe.load_from_file(map_file)
+        camera = game_camera(probe)
+        screen = pg.display.set_mode((camera.view_width + cs.SIDE_PANEL, camera.view_height))
+
+        results, enemy_count, turret_count = bench_static(map_file, wave, turrets_per_type, repeats, screen)
+        results["frame"] = bench_frames(map_file, wave, turrets_per_type, frames, screen, font)
+        for name, timing in results.items():
+            rows.append({"map": map_file, "wave": wave if map_level(map_file) == 4 else None,
+                         "enemies": enemy_count, "turrets": turret_count, "benchmark": name, **timing})
+    pg.quit()
+    return rows
+
+
+def print_report(rows, baseline=None):
+    previous = {(row["map"], row["benchmark"]): row for row in baseline or []}
+    print(f"{'map':<26} {'benchmark':<10} {'enemies':>7} {'turrets':>7} {'best ms':>9} {'median ms':>10}"
+          + ("  vs baseline" if baseline else ""))
+    for row in rows:
+        line = (f"{row['map']:<26} {row['benchmark']:<10} {row['enemies']:>7} {row['turrets']:>7} "
+                f"{row['best_ms']:>9.3f} {row['median_ms']:>10.3f}")
+        old = previous.get((row["map"], row["benchmark"]))
+        if old and old["median_ms"]:
+            line += f"  {row['median_ms'] / old['median_ms']:>6.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--maps", nargs="+", default=sorted(glob.glob("maps/*.txt")), help="map files to benchmark")
+    parser.add_argument("--wave", type=int, default=10, help="endless waves already survived on the endless map")
+    parser.add_argument("--turrets", type=int, default=3, help="turrets of each type")
+    parser.add_argument("--repeats", type=int, default=20, help="timing runs per benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="main loop frames to time")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare medians against")
+    args = parser.parse_args()
+
+    rows = run(args.maps, args.wave, args.turrets, args.repeats, args.frames)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+    print_report(rows, baseline)
+
+    if args.output:
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pygame": pg.version.ver,
+            "asset_load": assets.load_times,
+            "settings": {"wave": args.wave, "turrets_per_type": args.turrets,
+                         "repeats": args.repeats, "frames": args.frames},
+            "results": rows,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
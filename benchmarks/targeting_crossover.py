@@ -0,0 +1,112 @@
+"""
+Compare per-turret targeting with the batched NumPy kernel and find the crossover point.
+
+For every (turrets, enemies) combination the script times one targeting pass of:
+- sprite: Turret.find_target per turret over the whole enemy group
+- grid:   Turret.find_target per turret using the map's spatial index
+- batch:  batch_targets for all turrets at once
+and checks that all three choose identical targets.
+
+Usage (from the project root):
+    python -m benchmarks.targeting_crossover [--map maps/endless_level.txt] [--repeats 20]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import random
+import sys
+import timeit
+
+import pygame as pg
+
+from map import Map
+from enemies import Enemy
+from turrets import Turret
+from batch_targeting import batch_targets
+
+TURRET_COUNTS = [1, 5, 10, 25, 50, 100]
+ENEMY_COUNTS = [5, 10, 25, 50, 100, 250, 500, 1000]
+
+
+def build_scenario(map_file, turret_count, enemy_count, seed=0):
+    """Create a map with enemies spread along walkable tiles and turrets on grass."""
+    rng = random.Random(seed)
+    game_map = Map()
+    game_map.load_from_file(map_file)
+
+    walkable = [pos for tile_type in ("path", "marsh", "start", "finish")
+                for pos in game_map.tile_positions[tile_type]]
+    enemy_group = pg.sprite.Group()
+    for _ in range(enemy_count):
+        enemy = Enemy(game_map, rng.choice(["normal", "heavy", "fast"]))
+        tile_x, tile_y = rng.choice(walkable)
+        enemy.center = (tile_x * game_map.tile_size + rng.randrange(game_map.tile_size),
+                        tile_y * game_map.tile_size + rng.randrange(game_map.tile_size))
+        enemy.current_path_index = rng.randrange(len(enemy.path) or 1)
+        game_map.enemy_grid.move(enemy, enemy.center)
+        enemy_group.add(enemy)
+
+    grass = game_map.tile_positions["grass"]
+    turrets = []
+    for _ in range(turret_count):
+        tile_pos = rng.choice(grass)
+        tower_type = rng.choice(["tower_1", "tower_2", "tower_3",
+                                 "tower_1_upgrade", "tower_2_upgrade", "tower_3_upgrade"])
+        turrets.append(Turret(game_map.get_tile_center(tile_pos), tower_type, tile_pos))
+    return game_map, enemy_group, turrets
+
+
+def best_time(func, repeats):
+    """Return the fastest of several single runs, in milliseconds."""
+    return min(timeit.repeat(func, number=1, repeat=repeats)) * 1000
+
+
+def run(map_file, repeats):
+    rows = []
+    for turret_count in TURRET_COUNTS:
+        for enemy_count in ENEMY_COUNTS:
+            game_map, enemy_group, turrets = build_scenario(map_file, turret_count, enemy_count)
+
+            sprite_targets = [turret.find_target(enemy_group) for turret in turrets]
+            grid_targets = [turret.find_target(enemy_group, game_map.enemy_grid) for turret in turrets]
+            batch = [target for _, target in batch_targets(turrets, enemy_group)]
+            if not (sprite_targets == grid_targets == batch):
+                sys.exit(f"Target mismatch at {turret_count} turrets x {enemy_count} enemies")
+
+            rows.append({
+                "turrets": turret_count,
+                "enemies": enemy_count,
+                "sprite_ms": best_time(lambda: [t.find_target(enemy_group) for t in turrets], repeats),
+                "grid_ms": best_time(lambda: [t.find_target(enemy_group, game_map.enemy_grid) for t in turrets], repeats),
+                "batch_ms": best_time(lambda: list(batch_targets(turrets, enemy_group)), repeats),
+            })
+    return rows
+
+
+def print_report(rows):
+    print(f"{'turrets':>8} {'enemies':>8} {'sprite ms':>10} {'grid ms':>10} {'batch ms':>10}  fastest")
+    for row in rows:
+        times = {"sprite": row["sprite_ms"], "grid": row["grid_ms"], "batch": row["batch_ms"]}
+        print(f"{row['turrets']:>8} {row['enemies']:>8} {row['sprite_ms']:>10.3f} "
+              f"{row['grid_ms']:>10.3f} {row['batch_ms']:>10.3f}  {min(times, key=times.get)}")
+
+    # Crossover: smallest enemy count at which batch beats the best per-sprite mode
+    print("\nCrossover (batch faster than per-sprite targeting):")
+    for turret_count in TURRET_COUNTS:
+        crossover = next((row["enemies"] for row in rows
+                          if row["turrets"] == turret_count
+                          and row["batch_ms"] < min(row["sprite_ms"], row["grid_ms"])), None)
+        label = f"from {crossover} enemies" if crossover is not None else "not reached"
+        print(f"  {turret_count:>4} turrets: {label}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--map", default="maps/endless_level.txt", help="map file to place units on")
+    parser.add_argument("--repeats", type=int, default=20, help="timing runs per scenario (best is kept)")
+    args = parser.parse_args()
+
+    pg.init()
+    pg.display.set_mode((1, 1))
+    print_report(run(args.map, args.repeats))
@@ -22,7 +22,7 @@ class Button:
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
 
     def draw(self, surface):
-        """Draw the button with hover effect and text on the given surface."""
+        """Draw the button with hover effect and text on the given surface. Returns the button rect."""
         mouse_pos = pg.mouse.get_pos()
         hovered = self.rect.collidepoint(mouse_pos)
 
@@ -34,6 +34,7 @@ class Button:
 
         # Draw text centered in the button
         surface.blit(self.text_surface, self.text_rect)
+        return self.rect.copy()
 
     def is_clicked(self, event):
         """Check if the button was clicked with the left mouse button."""
@@ -0,0 +1,146 @@
+import math
+import weakref
+import pygame as pg
+import constant as cs
+
+class Camera:
+    """
+    Scrollable, zoomable view onto the map in the left part of the window.
+
+    The position is the top-left corner of the view in zoomed (screen) pixels, so with a tile
+    size that scales to whole pixels every tile lands on exact pixel boundaries. World positions
+    are the unzoomed map pixels used by the game logic and the sprite rects.
+    Scaled copies of images are created once per zoom level and cached.
+    """
+    def __init__(self, view_size, world_size, zoom_levels=cs.ZOOM_LEVELS):
+        self.view_width, self.view_height = view_size
+        self.world_width, self.world_height = world_size
+        self.zoom_levels = zoom_levels
+        self.zoom_index = zoom_levels.index(1) if 1 in zoom_levels else 0
+        self.x = 0
+        self.y = 0
+        # Source surface -> {zoom: scaled copy}; entries go away together with their source image
+        self.scaled_images = weakref.WeakKeyDictionary()
+        self.clamp()
+
+    @property
+    def zoom(self):
+        return self.zoom_levels[self.zoom_index]
+
+    @property
+    def view_rect(self):
+        """
+        Area of the window the map is drawn into.
+        """
+        return pg.Rect(0, 0, self.view_width, self.view_height)
+
+    def set_world_size(self, world_size):
+        """
+        Show a new map, e.g. after a level change, starting from its top-left corner.
+        """
+        self.world_width, self.world_height = world_size
+        self.x = self.y = 0
+        self.clamp()
+
+    def clamp(self):
+        """
+        Keep the view on the map. A map smaller than the view is centred in it.
+        """
+        max_x = round(self.world_width * self.zoom) - self.view_width
+        max_y = round(self.world_height * self.zoom) - self.view_height
+        self.x = max_x // 2 if max_x < 0 else min(max(self.x, 0), max_x)
+        self.y = max_y // 2 if max_y < 0 else min(max(self.y, 0), max_y)
+        # World area covered by the view, used to skip everything outside it
+        self.world_view = pg.Rect(math.floor(self.x / self.zoom), math.floor(self.y / self.zoom),
+                                  math.ceil(self.view_width / self.zoom) + 1,
+                                  math.ceil(self.view_height / self.zoom) + 1)
+
+    def pan(self, dx, dy):
+        """
+        Scroll by a number of screen pixels. Returns True if the view moved.
+        """
+        old = (self.x, self.y)
+        self.x += dx
+        self.y += dy
+        self.clamp()
+        return (self.x, self.y) != old
+
+    def zoom_by(self, steps, anchor=None):
+        """
+        Step through the zoom levels, keeping the map point under anchor (a screen position,
+        the view centre by default) in place. Returns True if the zoom changed.
+        """
+        index = min(max(self.zoom_index + steps, 0), len(self.zoom_levels) - 1)
+        if index == self.zoom_index:
+            return False
+        if anchor is None:
+            anchor = (self.view_width // 2, self.view_height // 2)
+        world_x, world_y = self.screen_to_world(anchor)
+        self.zoom_index = index
+        self.x = round(world_x * self.zoom) - anchor[0]
+        self.y = round(world_y * self.zoom) - anchor[1]
+        self.clamp()
+        return True
+
+    def follow(self, world_rect):
+        """
+        Scroll just enough to bring a world rect (e.g. the keyboard cursor tile) into view.
+        Returns True if the view moved.
+        """
+        left, top = self.world_to_screen(world_rect.topleft)
+        right, bottom = self.world_to_screen(world_rect.bottomright)
+        dx = min(left, 0) or max(right - self.view_width, 0)
+        dy = min(top, 0) or max(bottom - self.view_height, 0)
+        return self.pan(dx, dy)
+
+    def contains(self, screen_pos):
+        """
+        Return True if a screen position lies inside the map view.
+        """
+        return 0 <= screen_pos[0] < self.view_width and 0 <= screen_pos[1] < self.view_height
+
+    def world_to_screen(self, world_pos):
+        return (math.floor(world_pos[0] * self.zoom) - self.x, math.floor(world_pos[1] * self.zoom) - self.y)
+
+    def screen_to_world(self, screen_pos):
+        return ((screen_pos[0] + self.x) / self.zoom, (screen_pos[1] + self.y) / self.zoom)
+
+    def is_visible(self, world_rect):
+        return self.world_view.colliderect(world_rect)
+
+    def visible_tiles(self, tile_size, columns, rows):
+        """
+        Return the (first column, first row, end column, end row) range of tiles inside the view.
+        """
+        size = tile_size * self.zoom
+        return (max(math.floor(self.x / size), 0), max(math.floor(self.y / size), 0),
+                min(math.ceil((self.x + self.view_width) / size), columns),
+                min(math.ceil((self.y + self.view_height) / size), rows))
+
+    def scaled(self, image):
+        """
+        Return image scaled to the current zoom, created on first use.
+        """
+        zoom = self.zoom
+        if zoom == 1:
+            return image
+        copies = self.scaled_images.get(image)
+        if copies is None:
+            copies = self.scaled_images[image] = {}
+        scaled = copies.get(zoom)
+        if scaled is None:
+            size = (round(image.get_width() * zoom), round(image.get_height() * zoom))
+            # Colour-keyed images are scaled without filtering so no blended key colour shows at the edges
+            if image.get_colorkey() is None and image.get_bitsize() >= 24:
+                scaled = pg.transform.smoothscale(image, size)
+            else:
+                scaled = pg.transform.scale(image, size)
+            copies[zoom] = scaled
+        return scaled
+
+    def project(self, image, world_rect):
+        """
+        Return the scaled image and the screen rect to draw it at for a sprite at world_rect.
+        """
+        scaled = self.scaled(image)
+        return scaled, scaled.get_rect(center=self.world_to_screen(world_rect.center))
@@ -4,7 +4,7 @@ import re
 
 # Dialog window for configuring game mode and connection settings
 class ConfigDialog:
-    def __init__(self, master):
+    def __init__(self, master, save_backends=(), enabled_backends=()):
         self.master = master
         master.title("Game Configuration")
 
@@ -39,6 +39,15 @@ class ConfigDialog:
         self.port_entry.bind("<FocusOut>", self.restore_port_placeholder)
         self.port_entry['validatecommand'] = (master.register(self.validate_port_char), '%P')
 
+        # --- Save Formats ---
+        # One checkbox per save backend, only the checked ones are written to
+        self.save_label = tk.Label(master, text="Save to:")
+        self.save_label.pack()
+        self.save_vars = {}
+        for name, label in save_backends:
+            self.save_vars[name] = tk.BooleanVar(value=name in enabled_backends)
+            tk.Checkbutton(master, text=label, variable=self.save_vars[name]).pack()
+
         # --- Confirm Button ---
         self.confirm_button = tk.Button(master, text="Start Game", command=self.validate_inputs)
         self.confirm_button.pack(pady=10)
@@ -113,7 +122,8 @@ class ConfigDialog:
                 return
 
         # Build result based on mode
-        config_data = {"mode": mode, "ip": None, "port": None}
+        config_data = {"mode": mode, "ip": None, "port": None,
+                       "save_backends": [name for name, var in self.save_vars.items() if var.get()]}
 
         if mode == "network":
             config_data["ip"] = ip
@@ -125,15 +135,17 @@ class ConfigDialog:
         self.master.destroy()
 
 # Opens the config dialog window and returns selected values
-def get_config():
+# save_backends: (name, label) pairs to offer, enabled_backends: names checked by default
+def get_config(save_backends=(), enabled_backends=()):
     root = tk.Tk()
-    root.geometry("300x300+600+200")  # Size + center placement
-    dialog = ConfigDialog(root)
+    root.geometry(f"300x{300 + 25 * len(save_backends)}+600+200")  # Size + center placement
+    dialog = ConfigDialog(root, save_backends, enabled_backends)
     root.mainloop()
     return dialog.result
 
 # Dialog to choose from where to load saved game state
-def select_save_source():
+# sources: (name, label) pairs, the selected name is returned; default: name selected initially
+def select_save_source(sources, default=None):
     class SaveSourceDialog:
         def __init__(self, master):
             self.master = master
@@ -142,10 +154,9 @@ def select_save_source():
 
             tk.Label(master, text="Select source to load game state:").pack(pady=10)
 
-            self.var = tk.StringVar(value="json")
-            tk.Radiobutton(master, text="JSON", variable=self.var, value="json").pack(anchor="w", padx=20)
-            tk.Radiobutton(master, text="XML", variable=self.var, value="xml").pack(anchor="w", padx=20)
-            tk.Radiobutton(master, text="MongoDB", variable=self.var, value="mongo").pack(anchor="w", padx=20)
+            self.var = tk.StringVar(value=default or sources[0][0])
+            for name, label in sources:
+                tk.Radiobutton(master, text=label, variable=self.var, value=name).pack(anchor="w", padx=20)
 
             tk.Button(master, text="Continue", command=self.set_and_close).pack(pady=10)
 
@@ -154,7 +165,7 @@ def select_save_source():
             self.master.destroy()
 
     root = tk.Tk()
-    root.geometry("250x200+600+300")
+    root.geometry(f"250x{110 + 25 * len(sources)}+600+300")
     dialog = SaveSourceDialog(root)
     root.mainloop()
     return dialog.selected
@@ -4,12 +4,67 @@ TILE_SIZE = 64
 # Width (in pixels) of the right-side panel used for UI/buttons
 SIDE_PANEL = 300
 
-# Frames per second – controls the game's update and rendering speed
+# Largest part of the map shown at once, in pixels; bigger maps scroll with the camera
+VIEW_WIDTH = 1152
+VIEW_HEIGHT = 768
+
+# Zoom factors the camera steps through (TILE_SIZE times each factor should be a whole number)
+ZOOM_LEVELS = (0.5, 0.75, 1, 1.5, 2)
+
+# Camera scroll speed while an arrow key is held, in screen pixels per frame
+CAMERA_SCROLL_SPEED = 16
+
+# Frames per second – controls the rendering speed
 FPS = 60
 
-# Delay between enemy spawns in milliseconds
+# Simulation ticks per second – game logic always advances in steps of this fixed size
+SIM_TICK_RATE = 60
+
+# Most simulation ticks run in one rendered frame when catching up after slow frames
+MAX_SIM_TICKS_PER_FRAME = 10
+
+# Delay between enemy spawns in milliseconds of simulation time
 SPAWN_RATE = 400
 
+# Number of distinct angles sprites can be rotated to (rotations are cached per angle)
+ROTATION_STEPS = 64
+
+# Most rendered text surfaces (HUD, log, menus) kept in the text cache
+TEXT_CACHE_SIZE = 256
+
+# Lowest level written to the log ("DEBUG" also logs every single turret hit)
+LOG_LEVEL = "INFO"
+
+# Size of the log file before it is rotated, in bytes
+LOG_FILE_MAX_BYTES = 1024 * 1024
+
+# Repeated combat events are logged as one summary per this many milliseconds
+LOG_SUMMARY_INTERVAL = 1000
+
+# Save backends enabled by default (the config dialog can change them): json, xml, mongo, journal, binary
+# (mongo_memory, kept in memory for tests and benchmarks, can be set here but is not offered in the dialog)
+# mongo needs a running server, so it is only used when chosen in the config dialog
+SAVE_BACKENDS = ["json", "xml", "journal", "binary"]
+
+# Seconds to wait for the last save to be written when the game exits
+SAVE_FLUSH_TIMEOUT = 5
+
+# The save journal is compacted into one full snapshot after this many change entries
+JOURNAL_COMPACT_EVERY = 20
+
+# MongoDB server used by the mongo save backend
+MONGO_URI = "mongodb://localhost:27017"
+MONGO_TIMEOUT_MS = 2000  # Give up on an unreachable server after this long instead of pymongo's 30 s
+
+# Folder for compiled map files (parsed grids and cost fields); None disables the cache
+MAP_CACHE_DIR = ".map_cache"
+
+# Threads decoding sprite files at startup (None: one per CPU core, as chosen by the thread pool)
+ASSET_LOAD_WORKERS = None
+
+# Maximum width in pixels of a sprite atlas, images are packed in rows up to this width
+ATLAS_WIDTH = 1024
+
 # Maximum upgrade level for any turret
 TURRET_MAX_LEVEL = 2
 
@@ -30,3 +85,8 @@ UPGRADE_COST = 200
 
 # Reward given to the player for completing a level
 LEVEL_COMPLETE_REWARD = 500
+
+# How turrets choose targets each tick:
+# "sprite" – each turret searches nearby enemies on its own
+# "batch"  – all ready turrets are matched against all enemies in one NumPy pass
+TARGETING_MODE = "sprite"
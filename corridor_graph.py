@@ -0,0 +1,170 @@
+import heapq
+import numpy as np
+from pathfinding import heuristic
+
+class CorridorGraph:
+    """
+    Abstract graph of the walkable tiles of a map for one movement class.
+
+    Nodes are the tiles where corridors meet or end (junctions and dead ends) plus a few
+    extra tiles such as the start and finish. Every other walkable tile has exactly two
+    walkable neighbours and lies on one corridor: a chain of tiles from one node to another.
+    Searches step from node to node over whole corridors, so their cost grows with the
+    number of junctions rather than with the map area, and only the corridors of the chosen
+    route are expanded back into tiles.
+
+    Building the graph walks every walkable tile, about as long as building a FlowField, and
+    it is built again after any terrain change. Enemies therefore keep following the shared,
+    incrementally repaired flow fields; the graph serves one-off searches between any two tiles.
+    """
+    def __init__(self, cost_grid, extra_nodes=()):
+        cost = cost_grid.item  # cost(y, x) as a plain float
+        passable = cost_grid != float('inf')
+        self.width = cost_grid.shape[1]
+        self.height = cost_grid.shape[0]
+        # Cheapest step on the map, scales the Manhattan heuristic so it never overestimates
+        self.min_cost = float(cost_grid[passable].min()) if passable.any() else 1.0
+
+        # Walkable neighbours of every tile, counted with shifted copies of the grid
+        degree = np.zeros(passable.shape, dtype=np.int8)
+        degree[1:, :] += passable[:-1, :]
+        degree[:-1, :] += passable[1:, :]
+        degree[:, 1:] += passable[:, :-1]
+        degree[:, :-1] += passable[:, 1:]
+        node_mask = passable & (degree != 2)
+        for x, y in extra_nodes:
+            if 0 <= x < self.width and 0 <= y < self.height and passable[y, x]:
+                node_mask[y, x] = True
+        ys, xs = np.nonzero(node_mask)
+
+        self.nodes = set(zip(xs.tolist(), ys.tolist()))
+        self.corridors = []    # Tuples of tiles from one node to another, both ends included
+        self.cumulative = []   # Per corridor: cumulative[k] = cost of entering its first k tiles
+        self.links = {node: [] for node in self.nodes}  # Node -> (corridor index, position of the node in it)
+        self.corridor_of = {}  # Tile between two nodes -> (corridor index, position in the corridor)
+
+        for node in sorted(self.nodes):
+            for neighbor in self.neighbors(node, passable):
+                if neighbor in self.nodes:
+                    if node < neighbor:  # Two neighbouring nodes, add their link only once
+                        self.add_corridor((node, neighbor), cost)
+                elif neighbor not in self.corridor_of:
+                    self.add_corridor(self.trace(node, neighbor, passable), cost)
+
+        # A closed loop without any junction has no node to start a corridor from: one of its
+        # tiles becomes a node and the loop a corridor leading from it back to itself
+        ys, xs = np.nonzero(passable & ~node_mask)
+        for tile in zip(xs.tolist(), ys.tolist()):
+            if tile not in self.corridor_of:
+                self.nodes.add(tile)
+                self.links[tile] = []
+                self.add_corridor(self.trace(tile, next(self.neighbors(tile, passable)), passable), cost)
+
+    def neighbors(self, tile, passable):
+        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            x, y = tile[0] + dx, tile[1] + dy
+            if 0 <= x < self.width and 0 <= y < self.height and passable[y, x]:
+                yield (x, y)
+
+    def trace(self, node, first, passable):
+        """
+        Follow a corridor from a node through first until the next node.
+        """
+        tiles = [node, first]
+        while tiles[-1] not in self.nodes:
+            previous = tiles[-2]
+            tiles.append(next(tile for tile in self.neighbors(tiles[-1], passable) if tile != previous))
+        return tuple(tiles)
+
+    def add_corridor(self, tiles, cost):
+        index = len(self.corridors)
+        self.corridors.append(tiles)
+        cumulative = [0.0]
+        for x, y in tiles:
+            cumulative.append(cumulative[-1] + cost(y, x))
+        self.cumulative.append(cumulative)
+        self.links[tiles[0]].append((index, 0))
+        self.links[tiles[-1]].append((index, len(tiles) - 1))
+        for position in range(1, len(tiles) - 1):
+            self.corridor_of[tiles[position]] = (index, position)
+
+    def segment_cost(self, corridor, start, end):
+        """
+        Cost of walking a corridor from position start to position end (entering every tile after start).
+        """
+        cumulative = self.cumulative[corridor]
+        if start < end:
+            return cumulative[end + 1] - cumulative[start + 1]
+        return cumulative[start] - cumulative[end]
+
+    def find_path(self, start, goal):
+        """
+        A* over the corridor graph from start to goal (grid positions, nodes or corridor tiles).
+
+        Returns:
+            A list of (x, y) positions from start to goal, an empty list if no path is found,
+            or None if start or goal is not a walkable tile the graph knows.
+        """
+        if start == goal:
+            return [start]
+        if (start not in self.nodes and start not in self.corridor_of) or \
+                (goal not in self.nodes and goal not in self.corridor_of):
+            return None
+
+        goal_link = self.corridor_of.get(goal)  # A goal inside a corridor is reached from either end
+        best = {}        # Tile -> cheapest known cost from start
+        came_from = {}   # Tile -> (previous tile, corridor, from position, to position)
+        open_set = []
+
+        def relax(tile, cost, link):
+            if cost < best.get(tile, float('inf')):
+                best[tile] = cost
+                came_from[tile] = link
+                heapq.heappush(open_set, (cost + heuristic(tile, goal) * self.min_cost, cost, tile))
+
+        def leave(tile, cost, corridor, position):
+            # Walk a corridor to its far end, or to the goal if it lies on this corridor
+            tiles = self.corridors[corridor]
+            if goal_link and goal_link[0] == corridor:
+                relax(goal, cost + self.segment_cost(corridor, position, goal_link[1]),
+                      (tile, corridor, position, goal_link[1]))
+            for end in (0, len(tiles) - 1):
+                if end != position:
+                    relax(tiles[end], cost + self.segment_cost(corridor, position, end), (tile, corridor, position, end))
+
+        if start in self.nodes:
+            best[start] = 0.0
+            heapq.heappush(open_set, (heuristic(start, goal) * self.min_cost, 0.0, start))
+        else:
+            leave(start, 0.0, *self.corridor_of[start])
+
+        while open_set:
+            _, cost, tile = heapq.heappop(open_set)
+            if cost > best[tile]:
+                continue  # Outdated queue entry
+            if tile == goal:
+                return self.expand(came_from, start, goal)
+            for corridor, position in self.links.get(tile, ()):
+                leave(tile, cost, corridor, position)
+
+        # No path found
+        return []
+
+    def expand(self, came_from, start, goal):
+        """
+        Turn the chain of corridor segments ending at goal into the full list of tiles.
+        """
+        segments = []
+        tile = goal
+        while tile != start:
+            segments.append(came_from[tile])
+            tile = came_from[tile][0]
+
+        path = [start]
+        for _, corridor, start_position, end_position in reversed(segments):
+            tiles = self.corridors[corridor]
+            if start_position < end_position:
+                path.extend(tiles[start_position + 1:end_position + 1])
+            else:
+                path.extend(reversed(tiles[end_position:start_position]))
+        return path
@@ -28,7 +28,7 @@ ENEMY_SPAWN_DATA = [
 ]
 
 # Stats for each enemy type
-# Defines their health points (hp) and movement speed
+# Defines their health points (hp) and movement speed (pixels per simulation tick)
 ENEMY_DATA = {
     "normal": {
         "hp": 10,      # Standard enemy with balanced stats
@@ -33,7 +33,6 @@ LEVEL_DATA = {
         "end_game": True,              # Marks the end of the game
         "set_mission": "Upgrade Tower"
     },
-    4: {
-      "wave":0  
-    }
+    # Endless mode: waves keep growing, the wave count is tracked on the map
+    4: {}
 }
@@ -0,0 +1,71 @@
+import math
+import numpy as np
+
+def get_line_tiles(x0, y0, x1, y1):
+    """
+    Return list of tile positions on the Bresenham line between two tiles (both ends included).
+    """
+    tiles = []
+    dx = abs(x1 - x0)
+    dy = abs(y1 - y0)
+    x, y = x0, y0
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+
+    if dx > dy:
+        err = dx / 2.0
+        while x != x1:
+            tiles.append((x, y))
+            err -= dy
+            if err < 0:
+                y += sy
+                err += dx
+            x += sx
+    else:
+        err = dy / 2.0
+        while y != y1:
+            tiles.append((x, y))
+            err -= dx
+            if err < 0:
+                x += sx
+                err += dy
+            y += sy
+
+    tiles.append((x1, y1))
+    return tiles
+
+def sight_radius(turret_data, tile_size):
+    """
+    Return the radius in tiles of the window around a turret that line of sight is needed for:
+    the tile of any enemy inside the largest turret range (upgrades included) lies within it.
+    """
+    return math.ceil(max(stats["range"] for stats in turret_data.values()) / tile_size)
+
+def compute_visibility(blocking, origin, radius):
+    """
+    Build a boolean mask of the tiles visible from an origin tile, within a square window.
+
+    Arguments:
+        blocking: 2D boolean array indexed [y, x], True where a tile blocks vision (e.g. mountains).
+        origin: Tuple (x, y) of the observing tile.
+        radius: Half the window size in tiles; tiles farther away are not checked.
+
+    Returns:
+        Tuple (left, top, mask): the grid position of the window's top-left tile and a 2D boolean
+        array indexed [y - top, x - left], True where the line from origin is not blocked.
+        The first and last tile of a line never block it.
+    """
+    height, width = blocking.shape
+    left, top = max(origin[0] - radius, 0), max(origin[1] - radius, 0)
+    right, bottom = min(origin[0] + radius + 1, width), min(origin[1] + radius + 1, height)
+    # Lines between two tiles of the window never leave it
+    blocked = blocking[top:bottom, left:right].tolist()  # Plain lists index faster in the loop
+    visible = np.ones((bottom - top, right - left), dtype=bool)
+
+    for target_y in range(top, bottom):
+        for target_x in range(left, right):
+            for tile_x, tile_y in get_line_tiles(origin[0], origin[1], target_x, target_y)[1:-1]:
+                if blocked[tile_y - top][tile_x - left]:
+                    visible[target_y - top, target_x - left] = False
+                    break
+    return left, top, visible
@@ -1,36 +1,49 @@
 import pygame as pg
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import time
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import constant as cs
+from text_cache import text_cache
 
 # Logger class that handles both file/console logging and in-game UI display
+# Records are handed to a background thread through a queue, so the game loop never waits on I/O
 class GameLogger:
     def __init__(self, max_lines=10):
-        self.logger = self._setup_logger()                  # Setup file + console logging
         self.display = GameLogDisplay(max_lines)           # In-game log panel
+        self.logger = self._setup_logger()                  # Setup file + console + panel logging
+        self.combat = CombatLog(self.logger)                # Per-second summaries of turret hits
+        atexit.register(self.close)
 
     # Configure Python logging with file rotation and console output
     def _setup_logger(self):
         logger = logging.getLogger("GameLogger")
-        logger.setLevel(logging.DEBUG)
+        logger.setLevel(cs.LOG_LEVEL)
 
         # Log to file with rotation
-        handler = RotatingFileHandler("game_logs.txt", maxBytes=10 * 1024, backupCount=3)
+        handler = RotatingFileHandler("game_logs.txt", maxBytes=cs.LOG_FILE_MAX_BYTES, backupCount=3)
         formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         handler.setFormatter(formatter)
-        logger.addHandler(handler)
 
         # Also print to console
         console = logging.StreamHandler()
         console.setFormatter(formatter)
-        logger.addHandler(console)
+
+        # And show in the in-game panel, also for modules that log through
+        # logging.getLogger("GameLogger") directly (e.g. the headless simulation)
+        panel = GameLogDisplayHandler(self.display)
+
+        # The logger itself only puts records on a queue, a listener thread runs the handlers
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        self.listener = QueueListener(log_queue, handler, console, panel)
+        self.listener.start()
 
         return logger
 
-    # Log to file/console and optionally show on-screen
+    # Log to file/console and show on-screen
     def log(self, message, type):
-        formatted = f"{type.upper()}: {message}"
-        self.display.add_log(formatted)  # Add to visual in-game log
-
         # Log based on type
         if type == 'info':
             self.logger.info(message)
@@ -39,6 +52,58 @@ class GameLogger:
         elif type == 'error':
             self.logger.error(message)
 
+    # Write pending combat summaries and wait until the listener has handled every record
+    def close(self):
+        if self.listener is not None:
+            self.combat.flush()
+            self.listener.stop()
+            self.listener = None
+
+
+# Counts repeated combat events and logs them as one summary line per interval
+# Counting a hit is a dictionary update, nothing is formatted or queued per hit
+class CombatLog:
+    def __init__(self, logger, interval=cs.LOG_SUMMARY_INTERVAL):
+        self.logger = logger
+        self.interval = interval / 1000  # Seconds of real time
+        self.hits = {}  # tower type -> [hits, damage]
+        self.last_flush = time.monotonic()
+
+    def hit(self, tower_type, damage):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        counts = self.hits.get(tower_type)
+        if counts is None:
+            counts = self.hits[tower_type] = [0, 0]
+        counts[0] += 1
+        counts[1] += damage
+        self.flush_due()
+
+    # Log the summary once the interval has passed (called on every hit and once per frame)
+    def flush_due(self):
+        now = time.monotonic()
+        if now - self.last_flush >= self.interval:
+            self.flush(now)
+
+    def flush(self, now=None):
+        self.last_flush = time.monotonic() if now is None else now
+        if not self.hits:
+            return
+        summary = ", ".join(f"{tower_type} {hits} hits / {damage} dmg"
+                            for tower_type, (hits, damage) in sorted(self.hits.items()))
+        self.hits = {}
+        self.logger.info("Combat: %s", summary)
+
+
+# Logging handler that forwards records to the in-game log panel
+class GameLogDisplayHandler(logging.Handler):
+    def __init__(self, display):
+        super().__init__()
+        self.display = display
+
+    def emit(self, record):
+        self.display.add_log(f"{record.levelname}: {record.getMessage()}")
+
 
 # Class to visually display game logs in the game window
 class GameLogDisplay:
@@ -46,30 +111,32 @@ class GameLogDisplay:
         self.max_lines = max_lines
         self.logs = []
         self.visible = False  # Visibility can be toggled
+        self.panel = None  # Semi-transparent panel surface, reused while the width stays the same
 
     def toggle(self):
         self.visible = not self.visible
 
+    # Called from the logging thread: the list is replaced, never changed in place,
+    # so draw() always iterates over a complete list
     def add_log(self, message):
-        self.logs.append(message)
-        if len(self.logs) > self.max_lines:
-            self.logs.pop(0)  # Keep only the most recent messages
+        self.logs = (self.logs + [message])[-self.max_lines:]  # Keep only the most recent messages
 
     # Render the logs to a section of the screen
     def draw(self, surface, font, x, y, width):
         if not self.visible:
-            return
+            return None
 
-        log_surface = pg.Surface((width, self.max_lines * 22 + 10))
-        log_surface.set_alpha(180)  # Semi-transparent background
-        log_surface.fill((0, 0, 0))  # Black background
+        if self.panel is None or self.panel.get_width() != width:
+            self.panel = pg.Surface((width, self.max_lines * 22 + 10))
+            self.panel.set_alpha(180)  # Semi-transparent background
+        self.panel.fill((0, 0, 0))  # Black background
 
         # Draw each log line
         for i, line in enumerate(self.logs):
-            text_surface = font.render(line, True, (255, 255, 255))
-            log_surface.blit(text_surface, (5, 5 + i * 22))
+            text_surface = text_cache.render(font, line, (255, 255, 255))
+            self.panel.blit(text_surface, (5, 5 + i * 22))
 
-        surface.blit(log_surface, (x, y))
+        return surface.blit(self.panel, (x, y))
 
 
 # Global logger instance to be imported and used across the project
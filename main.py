@@ -4,12 +4,13 @@ from enemies import Enemy
 from map import Map
 from turrets import Turret
 from buttons import Button
-from enemy_data import ENEMY_SPAWN_DATA
-from level_data import LEVEL_DATA
 from story_and_missions import StoryManager, MissionManager
 from logger import game_logger
 from config_dialog import get_config, select_save_source
-from save_and_load import json_manager,xml_manager,mongodb_manager
+from save_and_load import save_service, get_manager, backend_choices
+from simulation import Simulation
+from text_cache import text_cache
+from camera import Camera
 
 
 def show_start_menu():
@@ -31,8 +32,8 @@ def show_start_menu():
         pg.draw.rect(screen, "dodgerblue", continue_button, border_radius=8)
 
         # Render button labels
-        start_text = font.render("Start New Game", True, "white")
-        continue_text = font.render("Continue", True, "white")
+        start_text = text_cache.render(font, "Start New Game", "white")
+        continue_text = text_cache.render(font, "Continue", "white")
 
         # Blit text centered in each button
         screen.blit(start_text, start_text.get_rect(center=start_button.center))
@@ -48,14 +49,9 @@ def show_start_menu():
                     return "new"
                 # If "Continue" clicked, open file format selection and load accordingly
                 elif continue_button.collidepoint(event.pos):
-                    save_source = select_save_source()  # Prompt user to choose save format
-
-                    if save_source == "json":
-                        save_data = json_manager.load()
-                    elif save_source == "xml":
-                        save_data = xml_manager.load()
-                    elif save_source == "mongo":
-                        save_data = mongodb_manager.load()
+                    # Prompt user to choose save format, the journal replays fastest
+                    save_source = select_save_source(backend_choices(), "journal" if "journal" in cs.SAVE_BACKENDS else None)
+                    save_data = get_manager(save_source).load() if save_source else None
 
                     # If data is loaded successfully, return it with "continue"
                     if save_data:
@@ -80,8 +76,8 @@ def load_game_progress(game_map, save_data):
     if game_map.level == 4:
         wave = save_data.get("wave", 0)
         enemy_wave = save_data.get("enemy_data", {})
-        LEVEL_DATA[4]["wave"] = wave                    # Restore current wave count
-        ENEMY_SPAWN_DATA[3].update(enemy_wave)          # Update enemy counts for spawning
+        game_map.wave = wave                            # Restore current wave count
+        game_map.spawn_data[3].update(enemy_wave)       # Update enemy counts for spawning
 
     # Determine which map file to load based on level
     map_file = "maps/endless_level.txt" if game_map.level == 4 else f"maps/level{game_map.level}.txt"
@@ -108,26 +104,20 @@ def collect_save_data_json(game_map, turret_group):
             } for t in turret_group
         ],
 
-        "wave": LEVEL_DATA.get(4, {}).get("wave", 0),   # Current wave number (for endless mode)
-        "enemy_data": ENEMY_SPAWN_DATA[3]               # Number of enemies per type for endless mode
+        "wave": game_map.wave,                # Current wave number (for endless mode)
+        "enemy_data": dict(game_map.spawn_data[3])  # Number of enemies per type for endless mode (copied, saves are written later)
     }
 
 
 # Draws text onto the screen at a specified position
 def draw_text(text, font, text_col, x, y, surface):
-    img = font.render(text, True, text_col)
-    surface.blit(img, (x, y))
+    img = text_cache.render(font, text, text_col)
+    return surface.blit(img, (x, y))
 
 # Checks whether the game is over based on the player's HP
 def check_game_over(game_map):
     return game_map.hp <= 0
 
-# Updates all game entities like enemies and turrets
-def update_game_state(enemy_group, turret_group):
-    enemy_group.update()
-    for turret in turret_group:
-        turret.update(enemy_group)
-
 # Loads a specific level from file
 def load_level(level):
     filename = f"maps/level{level}.txt"
@@ -141,17 +131,26 @@ def load_level(level):
         game_logger.log(f"Failed to load map for level {level}", "error")
         return False
 
-def restore_turrets_from_data(turrets_data, turret_group):
-    from turrets import Turret  # Import the Turret class
-
-    # Recreate turret instances based on saved data
+def restore_turrets_from_data(turrets_data, simulation):
+    # Recreate turrets from saved data on the tiles under their saved positions,
+    # through the simulation so they get a tile position and a place on the turret grid
     for turret_info in turrets_data:
-        turret = Turret(
-            (turret_info["x"], turret_info["y"]),  # Set position
-            turret_info["type"]                    # Set turret type
-        )
-        turret.upgrade_turret = turret_info["level"]  # Restore upgrade level
-        turret_group.add(turret)  # Add turret to the turret group
+        tile_pos = simulation.map.get_tile_pos_at_position(turret_info["x"], turret_info["y"])
+        if tile_pos is None or not simulation.map.can_place_turret(tile_pos):
+            game_logger.log(f"Skipped saved turret at {(turret_info['x'], turret_info['y'])}", "warning")
+            continue
+        # The saved type already is the upgraded type (e.g. tower_1_upgrade), only the level is restored
+        turret = simulation.add_turret(tile_pos, turret_info["type"])
+        turret.upgrade_turret = turret_info["level"]
+
+
+def turret_under_mouse(game_map, camera):
+    # Look up the turret on the map tile under the mouse, None outside the map view
+    mouse_pos = pg.mouse.get_pos()
+    if not camera.contains(mouse_pos):
+        return None
+    tile_pos = game_map.get_tile_pos_at_position(*camera.screen_to_world(mouse_pos))
+    return game_map.turret_at(tile_pos) if tile_pos else None
 
 
 
@@ -196,100 +195,87 @@ def show_mode_selection_menu():
 
 
 # Handles drawing of all main game elements including turrets, enemies, and UI buttons
-def draw_game_elements(screen, game_map, turret_group, enemy_group, mission, font,
+# The terrain comes from the background surface; returns the rects that were drawn this frame
+# Map sprites are drawn through the camera, those outside its view are skipped
+def draw_game_elements(screen, game_map, camera, turret_group, enemy_group, mission, font,
                        placing_turrets, cursor_x, cursor_y, selected_turret,
                        upgrade_button, buy_turret_button, cancel_button,
                        start_wave_button, level_started,
                        turret1_button, turret2_button, turret3_button):
-
-    game_map.draw(screen)
+    dirty = []
+    screen.set_clip(camera.view_rect)  # Sprites at the edge of the view must not spill into the side panel
 
     if placing_turrets:
-        if 0 <= cursor_x < game_map.width and 0 <= cursor_y < game_map.height:
-            tile = game_map.tiles[cursor_y][cursor_x]
-            highlight = pg.Surface((cs.TILE_SIZE, cs.TILE_SIZE))
+        if game_map.in_bounds(cursor_x, cursor_y):
+            size = round(cs.TILE_SIZE * camera.zoom)
+            highlight = pg.Surface((size, size))
             highlight.fill((0, 0, 0))
             highlight.set_alpha(100)
-            screen.blit(highlight, tile.rect.topleft)
+            dirty.append(screen.blit(highlight, camera.world_to_screen((cursor_x * cs.TILE_SIZE, cursor_y * cs.TILE_SIZE))))
 
     for turret in turret_group:
-        turret.draw(screen)
+        dirty.extend(turret.draw(screen, camera))
+
+    dirty.extend(screen.blits([camera.project(enemy.image, enemy.rect) for enemy in enemy_group
+                               if camera.is_visible(enemy.rect)]))
+    screen.set_clip(None)
 
-    enemy_group.draw(screen)
-    game_logger.display.draw(screen, font, 10, game_map.height * cs.TILE_SIZE - 250, game_map.width * cs.TILE_SIZE)
+    dirty.append(game_logger.display.draw(screen, font, 10, camera.view_height - 250, camera.view_width))
     if not mission.check_upgrade_mission(turret_group, game_map):
-        mission.draw_mission(screen, font)
+        dirty.append(mission.draw_mission(screen, font))
 
-    draw_text(f"HP: {game_map.hp}", font, "black", game_map.width * cs.TILE_SIZE + 10, 0, screen)
-    draw_text(f"Money: {game_map.money}", font, "black", game_map.width * cs.TILE_SIZE + 100, 0, screen)
-    buy_turret_button.draw(screen)
+    dirty.append(draw_text(f"HP: {game_map.hp}", font, "black", camera.view_width + 10, 0, screen))
+    dirty.append(draw_text(f"Money: {game_map.money}", font, "black", camera.view_width + 100, 0, screen))
+    dirty.append(buy_turret_button.draw(screen))
 
     if placing_turrets:
-        turret1_button.draw(screen)
-        turret2_button.draw(screen)
-        turret3_button.draw(screen)
-        cancel_button.draw(screen)
+        dirty.append(turret1_button.draw(screen))
+        dirty.append(turret2_button.draw(screen))
+        dirty.append(turret3_button.draw(screen))
+        dirty.append(cancel_button.draw(screen))
 
     if selected_turret and not placing_turrets and selected_turret.upgrade_turret < cs.TURRET_MAX_LEVEL:
-        upgrade_button.draw(screen)
+        dirty.append(upgrade_button.draw(screen))
 
     if not level_started:
-        start_wave_button.draw(screen)
-
-# Handles spawning of enemies based on a spawn timer
-def handle_wave_spawning(game_map, enemy_group, last_enemy_spawn):
-    current_time = pg.time.get_ticks()
-    if current_time - last_enemy_spawn > cs.SPAWN_RATE:
-        if game_map.spawned_enemy < len(game_map.enemy_list):
-            enemy_type = game_map.enemy_list[game_map.spawned_enemy]
-            enemy = Enemy(game_map, enemy_type)
-            enemy_group.add(enemy)
-            game_map.spawned_enemy += 1
-            return current_time
-    return last_enemy_spawn
+        dirty.append(start_wave_button.draw(screen))
+
+    return [rect for rect in dirty if rect]
+
+# Builds the static part of the screen: the terrain inside the camera view and the empty side panel
+# Every frame only the areas drawn over in the previous frame are restored from it,
+# it is built again whenever the camera scrolls or zooms
+def build_background(screen, game_map, camera):
+    background = pg.Surface(screen.get_size()).convert()
+    background.fill("grey100")
+    game_map.draw(background, camera)
+    return background
 
 # Handles what happens when a level is completed (story mode or endless)
-def handle_level_progression(game_map, turret_group, mission, plot):
-    game_map.reset_level()
-    game_map.money += cs.LEVEL_COMPLETE_REWARD
-    level_info = LEVEL_DATA.get(game_map.level)
-
-    if level_info and game_map.level != 4:
-        if level_info.get("reset_turrets"):
-            for turret in turret_group:
-                turret.delete_turret()
-
-        if mission_text := level_info.get("set_mission"):
-            mission.set_mission(mission_text)
-
-        if level_info.get("end_game"):
-            plot.show_popup(level_info["story"])
-            return True, 1
-        else:
-            game_map.load_from_file(level_info["map"])
-            game_map.level += 1
-            plot.show_popup(level_info["story"])
-    elif game_map.level == 4:
-        # Endless mode logic
-        wave = LEVEL_DATA[4].get("wave", 0) + 1
-        LEVEL_DATA[4]["wave"] = wave
-        ENEMY_SPAWN_DATA[3]["normal"] += 1
-        ENEMY_SPAWN_DATA[3]["heavy"] += 1
-        ENEMY_SPAWN_DATA[3]["fast"] += 1
+# Game state changes happen in the simulation; this adds missions, story popups and saving
+def handle_level_progression(simulation, mission, plot):
+    game_map = simulation.map
+    turret_group = simulation.turrets
+    level_info = simulation.complete_wave() or {}
 
-    game_map.generate_enemy_list()
-    # Saves to different formats
-    json_manager.save(collect_save_data_json(game_map,turret_group))
-    xml_manager.save(collect_save_data_json(game_map,turret_group))
-    mongodb_manager.save(collect_save_data_json(game_map,turret_group))
+    if mission_text := level_info.get("set_mission"):
+        mission.set_mission(mission_text)
+
+    if plot and "story" in level_info:
+        plot.show_popup(level_info["story"])
+
+    if level_info.get("end_game"):
+        return True, 1
+
+    # Snapshot the state once, the save service writes every format in the background
+    save_service.save(collect_save_data_json(game_map,turret_group))
 
     return False, 0
 
 # === MAIN GAME LOOP ===
 def main(game_mode, game_map, mission,save_data=None):
     clock = pg.time.Clock()
-    last_enemy_spawn = pg.time.get_ticks()
-    
+
     if game_mode == 'endless':
         map_loaded = game_map.load_from_file('maps/endless_level.txt')
         game_map.level = 4
@@ -307,7 +293,10 @@ def main(game_mode, game_map, mission,save_data=None):
         return
 
     # Set up screen and story (if applicable)
-    screen = pg.display.set_mode((game_map.width * cs.TILE_SIZE + cs.SIDE_PANEL, game_map.height * cs.TILE_SIZE))
+    # Maps bigger than the view scroll through the camera instead of growing the window
+    world_size = (game_map.width * cs.TILE_SIZE, game_map.height * cs.TILE_SIZE)
+    camera = Camera((min(world_size[0], cs.VIEW_WIDTH), min(world_size[1], cs.VIEW_HEIGHT)), world_size)
+    screen = pg.display.set_mode((camera.view_width + cs.SIDE_PANEL, camera.view_height))
     pg.display.set_caption("Tower Defense Game")
 
     if game_mode == "plot":
@@ -318,62 +307,116 @@ def main(game_mode, game_map, mission,save_data=None):
     game_map.generate_enemy_list()
     enemy_group = pg.sprite.Group()
     turret_group = pg.sprite.Group()
+    # Game logic runs in the simulation, this loop handles input and drawing
+    simulation = Simulation(game_map, enemy_group, turret_group, enemy_factory=Enemy, turret_factory=Turret)
     # Add turrets from previous save
     if game_mode == 'continue' and save_data:
-        restore_turrets_from_data(turrets_to_restore, turret_group)
+        restore_turrets_from_data(turrets_to_restore, simulation)
 
 
 
     # UI buttons
-    upgrade_button = Button(game_map.width * cs.TILE_SIZE + 75, 60, 200, 50, "Upgrade turret", font)
-    buy_turret_button = Button(game_map.width * cs.TILE_SIZE + 75, 120, 150, 50, "Buy turret", font)
-    cancel_button = Button(game_map.width * cs.TILE_SIZE + 75, 300, 150, 50, "Cancel", font)
-    start_wave_button = Button(game_map.width * cs.TILE_SIZE + 75, 400, 150, 50, "Start wave", font)
+    upgrade_button = Button(camera.view_width + 75, 60, 200, 50, "Upgrade turret", font)
+    buy_turret_button = Button(camera.view_width + 75, 120, 150, 50, "Buy turret", font)
+    cancel_button = Button(camera.view_width + 75, 300, 150, 50, "Cancel", font)
+    start_wave_button = Button(camera.view_width + 75, 400, 150, 50, "Start wave", font)
 
-    turret1_button = Button(game_map.width * cs.TILE_SIZE + 25, 180, 100, 40, "Tower 1", font)
-    turret2_button = Button(game_map.width * cs.TILE_SIZE + 135, 180, 100, 40, "Tower 2", font)
-    turret3_button = Button(game_map.width * cs.TILE_SIZE + 75, 230, 100, 40, "Tower 3", font)
+    turret1_button = Button(camera.view_width + 25, 180, 100, 40, "Tower 1", font)
+    turret2_button = Button(camera.view_width + 135, 180, 100, 40, "Tower 2", font)
+    turret3_button = Button(camera.view_width + 75, 230, 100, 40, "Tower 3", font)
 
     # Game state flags
     placing_turrets = False
     selected_turret = None
+    hovered_turret = None
     selected_turret_type = "tower_1"
     dragging_turret = False
     dragged_turret_image = None
-    level_started = False
     game_over = False
     game_outcome = 0
     cursor_x, cursor_y = 0, 0
 
+    # Rendering state: static background and the rects drawn over it last frame
+    background = build_background(screen, game_map, camera)
+    dirty_rects = []
+    full_redraw = True
+    view_changed = False  # Camera scrolled or zoomed, the background must be rebuilt
+    terrain_version = game_map.terrain_version  # Tiles changed during play also need a rebuild
+
     # Main game loop
     run = True
     while run:
-        clock.tick(cs.FPS)
-        screen.fill("grey100")
+        frame_ms = clock.tick(cs.FPS)
+
+        # Scroll the camera while arrow keys are held (the end screen shows no map)
+        keys = pg.key.get_pressed()
+        if not game_over and camera.pan((keys[pg.K_RIGHT] - keys[pg.K_LEFT]) * cs.CAMERA_SCROLL_SPEED,
+                                        (keys[pg.K_DOWN] - keys[pg.K_UP]) * cs.CAMERA_SCROLL_SPEED):
+            view_changed = True
+        if (view_changed or game_map.terrain_version != terrain_version) and not game_over:
+            background = build_background(screen, game_map, camera)
+            full_redraw = True
+            view_changed = False
+            terrain_version = game_map.terrain_version
+
+        # Restore what was drawn last frame, the rest of the screen already shows the background
+        if full_redraw:
+            screen.blit(background, (0, 0))
+        else:
+            for rect in dirty_rects:
+                screen.blit(background, rect, rect)
+        drawn_rects = []
 
         # === GAME LOGIC ===
         if not game_over:
-            if check_game_over(game_map):
-                game_over = True
-                game_outcome = -1
-
-            update_game_state(enemy_group, turret_group)
-
-            draw_game_elements(screen, game_map, turret_group, enemy_group, mission, font,
-                               placing_turrets, cursor_x, cursor_y, selected_turret,
-                               upgrade_button, buy_turret_button, cancel_button,
-                               start_wave_button, level_started,
-                               turret1_button, turret2_button, turret3_button)
-
-            if level_started:
-                last_enemy_spawn = handle_wave_spawning(game_map, enemy_group, last_enemy_spawn)
-
-            if game_map.level_finished():
-                level_started = False
-                game_over, game_outcome = handle_level_progression(game_map, turret_group, mission, plot)
+            # Run as many fixed simulation ticks as the elapsed real time requires
+            wave_cleared = False
+            for _ in range(simulation.clock.advance(frame_ms)):
+                if check_game_over(game_map):
+                    game_over = True
+                    game_outcome = -1
+                    break
+
+                simulation.step()
+
+                if simulation.wave_finished():
+                    wave_cleared = True
+                    break
+
+            game_logger.combat.flush_due()  # Summaries also appear once the shooting stops
+
+            # Show the range of the turret under the mouse
+            turret = turret_under_mouse(game_map, camera)
+            if turret is not hovered_turret:
+                if hovered_turret:
+                    hovered_turret.hovered = False
+                if turret:
+                    turret.hovered = True
+                hovered_turret = turret
+
+            drawn_rects = draw_game_elements(screen, game_map, camera, turret_group, enemy_group, mission, font,
+                                             placing_turrets, cursor_x, cursor_y, selected_turret,
+                                             upgrade_button, buy_turret_button, cancel_button,
+                                             start_wave_button, simulation.wave_active,
+                                             turret1_button, turret2_button, turret3_button)
+
+            if wave_cleared:
+                game_over, game_outcome = handle_level_progression(simulation, mission, plot)
+                # Story popups block the loop, don't fast-forward through that time
+                clock.tick()
+                simulation.clock.reset_accumulator()
+                # The next map may differ and popups draw over the whole window
+                camera.set_world_size((game_map.width * cs.TILE_SIZE, game_map.height * cs.TILE_SIZE))
+                background = build_background(screen, game_map, camera)
+                full_redraw = True
+
+            if game_over:
+                # The end screen shows only the result text
+                background.fill("grey100")
+                full_redraw = True
 
         else:
-            draw_text("You lost" if game_outcome == -1 else "You won", font, "black", 500, 200, screen)
+            drawn_rects.append(draw_text("You lost" if game_outcome == -1 else "You won", font, "black", 500, 200, screen))
 
 
         for event in pg.event.get():
@@ -389,7 +432,7 @@ def main(game_mode, game_map, mission,save_data=None):
                 if buy_turret_button.is_clicked(event):
                     placing_turrets = True
                 elif start_wave_button.is_clicked(event):
-                    level_started = True
+                    simulation.start_wave()
                 elif cancel_button.is_clicked(event):
                     placing_turrets = False
                 elif upgrade_button.is_clicked(event) and selected_turret and not placing_turrets:
@@ -413,34 +456,22 @@ def main(game_mode, game_map, mission,save_data=None):
                         dragging_turret = True
                         dragged_turret_image = Turret((0, 0), selected_turret_type).image
 
-                # Select existing turret
-                mouse_pos = pg.mouse.get_pos()
-                if mouse_pos[0] < game_map.width * cs.TILE_SIZE and mouse_pos[1] < game_map.height * cs.TILE_SIZE:
-                    turret_clicked = False
-                    for turret in turret_group:
-                        if turret.rect.collidepoint(mouse_pos):
-                            for t in turret_group:
-                                t.selected = False
-                            turret.selected = True
-                            selected_turret = turret
-                            turret_clicked = True
-                            break
-                    if not turret_clicked:
-                        for turret in turret_group:
-                            turret.selected = False
-                        selected_turret = None
+                # Select existing turret, a click on the map anywhere else clears the selection
+                if camera.contains(pg.mouse.get_pos()):
+                    if selected_turret:
+                        selected_turret.selected = False
+                    selected_turret = turret_under_mouse(game_map, camera)
+                    if selected_turret:
+                        selected_turret.selected = True
 
             # === MOUSE BUTTON RELEASE (for placing) ===
             elif event.type == pg.MOUSEBUTTONUP and event.button == 1 and dragging_turret:
                 mouse_pos = pg.mouse.get_pos()
-                if mouse_pos[0] < game_map.width * cs.TILE_SIZE and mouse_pos[1] < game_map.height * cs.TILE_SIZE:
-                    tile = game_map.get_tile_at_position(mouse_pos[0], mouse_pos[1])
-                    if tile:
-                        tile_center = tile.rect.center
-                        tile_pos = (tile.rect.x // cs.TILE_SIZE, tile.rect.y // cs.TILE_SIZE)
-                        if tile.tile_type == 'grass' and not any(t.tile_pos == tile_pos for t in turret_group) and game_map.money >= cs.BUY_COST:
-                            turret = Turret(tile_center, selected_turret_type, tile_pos)
-                            turret_group.add(turret)
+                if camera.contains(mouse_pos):
+                    tile_pos = game_map.get_tile_pos_at_position(*camera.screen_to_world(mouse_pos))
+                    if tile_pos:
+                        if game_map.can_place_turret(tile_pos) and game_map.money >= cs.BUY_COST:
+                            simulation.add_turret(tile_pos, selected_turret_type)
                             game_logger.log(f"Placed {selected_turret_type} at {tile_pos}", "info")
                             game_map.money -= cs.BUY_COST
                         else:
@@ -448,11 +479,23 @@ def main(game_mode, game_map, mission,save_data=None):
                 dragging_turret = False
                 dragged_turret_image = None
 
+            # === CAMERA ZOOM (mouse wheel over the map, keeps the point under the mouse in place) ===
+            elif event.type == pg.MOUSEWHEEL:
+                mouse_pos = pg.mouse.get_pos()
+                if camera.contains(mouse_pos) and camera.zoom_by(event.y, mouse_pos):
+                    view_changed = True
+
             # === KEYBOARD INPUT ===
             elif event.type == pg.KEYDOWN:
                 if event.key == pg.K_BACKQUOTE:  # toggle log
                     game_logger.display.toggle()
 
+                # Zoom the camera around the centre of the view
+                elif event.key in (pg.K_EQUALS, pg.K_PLUS, pg.K_KP_PLUS):
+                    view_changed = camera.zoom_by(1) or view_changed
+                elif event.key in (pg.K_MINUS, pg.K_KP_MINUS):
+                    view_changed = camera.zoom_by(-1) or view_changed
+
                 # Keyboard turret placement
                 elif event.key == pg.K_1:
                     selected_turret_type = "tower_1"
@@ -477,25 +520,35 @@ def main(game_mode, game_map, mission,save_data=None):
                     elif event.key == pg.K_d and cursor_x < game_map.width - 1:
                         cursor_x += 1
                     elif event.key == pg.K_RETURN:
-                        tile = game_map.tiles[cursor_y][cursor_x]
                         tile_pos = (cursor_x, cursor_y)
-                        tile_center = tile.rect.center
-                        if tile.tile_type == 'grass' and not any(t.tile_pos == tile_pos for t in turret_group) and game_map.money >= cs.BUY_COST:
-                            turret = Turret(tile_center, selected_turret_type, tile_pos)
-                            turret_group.add(turret)
+                        if game_map.can_place_turret(tile_pos) and game_map.money >= cs.BUY_COST:
+                            simulation.add_turret(tile_pos, selected_turret_type)
                             game_logger.log(f"Placed {selected_turret_type} at {tile_pos}", "info")
                             game_map.money -= cs.BUY_COST
                         else:
                             game_logger.log(f"Invalid turret placement attempt at {tile_pos}", "warning")
+                    # Keep the cursor tile in view
+                    cursor_rect = pg.Rect(cursor_x * cs.TILE_SIZE, cursor_y * cs.TILE_SIZE, cs.TILE_SIZE, cs.TILE_SIZE)
+                    view_changed = camera.follow(cursor_rect) or view_changed
 
         # === Draw dragged turret image ===
         if dragging_turret and dragged_turret_image:
             mouse_x, mouse_y = pg.mouse.get_pos()
-            img_rect = dragged_turret_image.get_rect(center=(mouse_x, mouse_y))
-            screen.blit(dragged_turret_image, img_rect)
-
-        pg.display.flip()
+            drag_image = camera.scaled(dragged_turret_image)
+            img_rect = drag_image.get_rect(center=(mouse_x, mouse_y))
+            drawn_rects.append(screen.blit(drag_image, img_rect))
+
+        # Push only the restored and newly drawn areas to the display
+        if full_redraw:
+            pg.display.flip()
+            full_redraw = False
+        else:
+            pg.display.update(dirty_rects + drawn_rects)
+        dirty_rects = drawn_rects
 
+    # Finish writing the last save before exiting, but don't hang on a backend that doesn't answer
+    if not save_service.flush(cs.SAVE_FLUSH_TIMEOUT):
+        game_logger.log("Last save was not finished before exiting", "warning")
     pg.quit()
 # === ENTRY POINT ===
 if __name__ == "__main__":
@@ -512,12 +565,11 @@ if __name__ == "__main__":
         save_data = choice[1]
     else:
         # Otherwise, get game configuration via Tkinter dialog
-        config = get_config()
+        config = get_config(backend_choices(), cs.SAVE_BACKENDS)
         if config:
-            # Save configuration to all supported formats (JSON, XML, MongoDB)
-            json_manager.save({"config": config})
-            mongodb_manager.save({"config": config})
-            xml_manager.save({"config": config})
+            # Save configuration to the formats selected in the dialog
+            save_service.set_backends(config["save_backends"])
+            save_service.save({"config": config})
 
             # Let user choose game mode (Endless or Plot)
             game_mode, save_data = show_mode_selection_menu()
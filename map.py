@@ -1,135 +1,120 @@
 import pygame as pg
 from tiles import Tile
+from tile_data import TILE_TYPES
 import constant as cs
 from enemy_data import ENEMY_SPAWN_DATA
-from logger import game_logger
+from assets import assets
+from map_state import MapState
 
-class Map:
-    def __init__(self, tile_size=cs.TILE_SIZE):
-        # Basic map state and properties
-        self.level = 1
-        self.tile_size = tile_size
-        self.tiles = []  # 2D list of Tile objects
+class Map(MapState):
+    """
+    Game map with graphics: MapState plus tile images and sprites for drawing.
+    """
+    def __init__(self, tile_size=cs.TILE_SIZE, spawn_data=ENEMY_SPAWN_DATA):
+        super().__init__(tile_size, spawn_data)
+        self.tiles = []  # 2D list of Tile objects, built on first use by get_tile_at_position
         self.tile_images = {}  # Mapping of tile type to its image
         self.load_tile_images()  # Load all tile graphics
         self.tile_group = pg.sprite.Group()  # For rendering efficiency
-        self.hp = cs.HEALTH
-        self.money = cs.MONEY
-        self.width = 0  # Determined after loading a map
-        self.height = 0
-        self.enemy_list = []  # Sequence of enemies to spawn
-        self.spawned_enemy = 0
-        self.enemies_killed = 0
-        self.enemies_missed = 0
+        self.background = None  # Whole terrain pre-rendered into one surface, built on first full draw
 
     def load_tile_images(self):
         """
-        Load tile graphics from disk. If not found, use a placeholder.
+        Get the tile graphics from the shared asset manager (a placeholder if one is missing).
         """
         tile_types = ['grass', 'path', 'mountain', 'forest', 'marsh', 'start', 'finish']
         for tile_type in tile_types:
-            try:
-                img_path = f"Sprites/tiles/{tile_type}.png"
-                self.tile_images[tile_type] = pg.image.load(img_path).convert_alpha()
-            except:
-                game_logger.log(f"Could not load image for {tile_type}", "error")
-                placeholder = pg.Surface((self.tile_size, self.tile_size))
-                placeholder.fill((0, 0, 0))
-                self.tile_images[tile_type] = placeholder
-
-    def level_finished(self):
-        """
-        Return True if all enemies have been processed (killed or missed).
-        """
-        return (self.enemies_killed + self.enemies_missed) >= len(self.enemy_list)
-
-    def generate_enemy_list(self):
-        """
-        Populate enemy_list based on current level’s spawn data.
-        """
-        enemies = ENEMY_SPAWN_DATA[self.level - 1]
-        for enemy_type, count in enemies.items():
-            for _ in range(count):
-                self.enemy_list.append(enemy_type)
-
-    def reset_level(self):
-        """
-        Reset map state to prepare for a new level.
-        """
-        self.enemies_killed = 0
-        self.enemies_missed = 0
-        self.enemy_list = []
-        self.spawned_enemy = 0
-
-    def load_from_file(self, filename):
-        """
-        Load tile layout from a txt map file.
-        """
-        self.clear_map()
-        try:
-            map_data = self.read_map_file(filename)
-            self.height = len(map_data)
-            self.width = len(map_data[0]) if self.height > 0 else 0
-            self.build_tiles_from_data(map_data)
-            return True
-        except Exception as e:
-            game_logger.log(f"Error loading map from {filename}: {e}", "error")
-            return False
+            self.tile_images[tile_type] = assets.image(f"tiles/{tile_type}", (self.tile_size, self.tile_size))
 
     def clear_map(self):
         """
         Clear all existing tiles and sprite groups.
         """
+        super().clear_map()
         self.tiles = []
         self.tile_group.empty()
+        self.background = None
 
-    def read_map_file(self, filename):
+    def build_tiles(self):
         """
-        Read map file into a 2D list of tile type strings.
-        """
-        map_data = []
-        with open(filename, 'r') as file:
-            for line in file:
-                row = line.strip().split(',')
-                map_data.append(row)
-        return map_data
-
-    def build_tiles_from_data(self, map_data):
-        """
-        Convert tile type strings into Tile objects and build the map grid.
+        Create a Tile sprite for every cell of the loaded grid.
         """
         for y in range(self.height):
             row = []
-            for x in range(len(map_data[y])):
-                tile_type = map_data[y][x]
-                tile = self.create_tile(x, y, tile_type)
+            for x in range(self.width):
+                tile = self.create_tile(x, y, self.get_tile_type(x, y))
                 row.append(tile)
                 self.tile_group.add(tile)
             self.tiles.append(row)
 
+    def render_background(self):
+        """
+        Bake all tiles into a single surface, straight from the tile code grid. Terrain does not
+        change during a level, so drawing the map afterwards is one blit instead of one per tile.
+        """
+        self.background = pg.Surface((self.width * self.tile_size, self.height * self.tile_size)).convert()
+        self.background.fill("grey100")  # Forest and other tiles with transparent edges show the window colour
+        images = [self.tile_images[tile_type] for tile_type in TILE_TYPES]
+        size = self.tile_size
+        self.background.blits([(images[code], (x * size, y * size))
+                               for y, row in enumerate(self.tile_codes.tolist())
+                               for x, code in enumerate(row)], doreturn=False)
+
+    def set_tile_type(self, tile_x, tile_y, tile_type):
+        """
+        Change one tile's terrain and redraw it in the pre-rendered background and its tile sprite.
+        """
+        if not super().set_tile_type(tile_x, tile_y, tile_type):
+            return False
+        image = self.tile_images[tile_type]
+        if self.background is not None:
+            rect = pg.Rect(tile_x * self.tile_size, tile_y * self.tile_size, self.tile_size, self.tile_size)
+            self.background.fill("grey100", rect)
+            self.background.blit(image, rect)
+        if self.tiles:
+            tile = self.tiles[tile_y][tile_x]
+            tile.image = image
+            tile.tile_type = tile_type
+        return True
+
     def create_tile(self, x, y, tile_type):
         """
         Create a tile of a specific type at a specific grid position.
-        If tile type is unknown, use a fallback grass tile.
         """
-        if tile_type in self.tile_images:
-            return Tile(x * self.tile_size, y * self.tile_size, self.tile_images[tile_type], tile_type)
-        else:
-            game_logger.log(f"Unknown tile type: {tile_type}", "warning")
-            return Tile(x * self.tile_size, y * self.tile_size, self.tile_images['grass'], 'grass')
+        return Tile(x * self.tile_size, y * self.tile_size, self.tile_images[tile_type], tile_type)
 
     def get_tile_at_position(self, x, y):
         """
         Given pixel coordinates, return the tile at that location.
         """
-        tile_x = x // self.tile_size
-        tile_y = y // self.tile_size
-        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
-            return self.tiles[tile_y][tile_x]
+        tile_pos = self.get_tile_pos_at_position(x, y)
+        if tile_pos:
+            if not self.tiles:
+                self.build_tiles()
+            return self.tiles[tile_pos[1]][tile_pos[0]]
         return None
 
-    def draw(self, surface):
-        """
-        Draw the full map using its sprite group.
-        """
-        self.tile_group.draw(surface)
+    def draw(self, surface, camera=None):
+        """
+        Draw the map. Without a camera the full map is drawn from the pre-rendered background,
+        with one only the tiles inside its view are drawn, using the tile images scaled to its zoom.
+        Returns the updated rect.
+        """
+        if not self.tile_codes.size:
+            return pg.Rect(0, 0, 0, 0)
+        if camera is None:
+            if self.background is None:
+                self.render_background()
+            return surface.blit(self.background, (0, 0))
+
+        images = [camera.scaled(self.tile_images[tile_type]) for tile_type in TILE_TYPES]
+        size = images[0].get_width()
+        first_x, first_y, end_x, end_y = camera.visible_tiles(self.tile_size, self.width, self.height)
+        codes = self.tile_codes[first_y:end_y, first_x:end_x].tolist()
+        clip = surface.get_clip()
+        surface.set_clip(camera.view_rect.clip(clip))
+        rect = surface.blits([(images[code], ((first_x + x) * size - camera.x, (first_y + y) * size - camera.y))
+                              for y, row in enumerate(codes)
+                              for x, code in enumerate(row)])
+        surface.set_clip(clip)
+        return rect[0].unionall(rect) if rect else pg.Rect(0, 0, 0, 0)
@@ -0,0 +1,133 @@
+import os
+import json
+import tempfile
+import hashlib
+import logging
+import numpy as np
+import constant as cs
+from tile_data import TILE_TYPES, MOVEMENT_COSTS
+
+log = logging.getLogger("GameLogger")
+
+# Bump when the layout of the cache files changes, so old entries are rebuilt
+CACHE_FORMAT = 2
+
+
+class CompiledMap:
+    """
+    Parsed form of a map file: tile code grid, cost grid and connected region labels per
+    movement class and the start and finish positions. Arrays loaded from the cache are
+    read-only memory maps.
+    """
+    def __init__(self, tile_codes, cost_grids, start_pos, finish_pos, components):
+        self.tile_codes = tile_codes
+        self.cost_grids = cost_grids
+        self.components = components
+        self.start_pos = start_pos
+        self.finish_pos = finish_pos
+
+
+def cache_key(source):
+    """
+    Hash of the map file contents and of the tile tables the compiled data depends on.
+    """
+    digest = hashlib.sha1(source)
+    digest.update(json.dumps([CACHE_FORMAT, TILE_TYPES, MOVEMENT_COSTS], sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def cache_paths(filename, key, cache_dir):
+    """
+    Return the metadata, tile code, cost grid and region label file paths of a cache entry.
+    """
+    base = os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(filename))[0]}-{key}")
+    return base + ".json", base + ".codes.npy", base + ".costs.npy", base + ".labels.npy"
+
+
+def load(filename, cache_dir=cs.MAP_CACHE_DIR):
+    """
+    Return the cached CompiledMap of a map file, or None if there is no entry for its current contents.
+    """
+    with open(filename, "rb") as f:
+        key = cache_key(f.read())
+    meta_path, codes_path, costs_path, labels_path = cache_paths(filename, key, cache_dir)
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        tile_codes = np.load(codes_path, mmap_mode="r")
+        costs = np.load(costs_path, mmap_mode="r")
+        labels = np.load(labels_path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        log.warning(f"Ignoring damaged map cache for {filename}: {e}")
+        return None
+
+    cost_grids = {move_class: costs[index] for index, move_class in enumerate(meta["movement_classes"])}
+    components = {move_class: labels[index] for index, move_class in enumerate(meta["movement_classes"])}
+    start_pos = tuple(meta["start"]) if meta["start"] else None
+    finish_pos = tuple(meta["finish"]) if meta["finish"] else None
+    return CompiledMap(tile_codes, cost_grids, start_pos, finish_pos, components)
+
+
+def store(filename, compiled, cache_dir=cs.MAP_CACHE_DIR):
+    """
+    Write a CompiledMap to the cache, replacing entries made from older versions of the file.
+    """
+    with open(filename, "rb") as f:
+        key = cache_key(f.read())
+    meta_path, codes_path, costs_path, labels_path = cache_paths(filename, key, cache_dir)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        remove_stale(filename, key, cache_dir)
+
+        movement_classes = list(compiled.cost_grids)
+        costs = np.stack([compiled.cost_grids[move_class] for move_class in movement_classes])
+        write_replace(codes_path, lambda f: np.save(f, np.ascontiguousarray(compiled.tile_codes)))
+        write_replace(costs_path, lambda f: np.save(f, costs))
+        labels = np.stack([compiled.components[move_class] for move_class in movement_classes])
+        write_replace(labels_path, lambda f: np.save(f, labels))
+
+        # Metadata is written last: an entry only counts once its arrays are complete
+        meta = {
+            "source": os.path.basename(filename),
+            "shape": list(compiled.tile_codes.shape),
+            "movement_classes": movement_classes,
+            "start": compiled.start_pos,
+            "finish": compiled.finish_pos,
+        }
+        write_replace(meta_path, lambda f: f.write(json.dumps(meta).encode("utf-8")))
+    except OSError as e:
+        log.warning(f"Could not write map cache for {filename}: {e}")
+
+
+def write_replace(path, write):
+    """
+    Fill a uniquely named temporary file with write(f), then move it over path in one step,
+    so processes filling the cache for the same map at once never write into each other's files.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def remove_stale(filename, key, cache_dir):
+    """
+    Delete cache entries of the same map file made from other contents.
+    """
+    prefix = os.path.splitext(os.path.basename(filename))[0] + "-"
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(prefix) and not entry.startswith(prefix + key):
+            entry_key = entry[len(prefix):].split(".")[0]
+            if len(entry_key) == len(key):  # Don't touch maps whose name merely shares the prefix
+                try:
+                    os.remove(os.path.join(cache_dir, entry))
+                except FileNotFoundError:
+                    pass  # Another process cleaned it up first
@@ -0,0 +1,482 @@
+import copy
+import math
+import logging
+import numpy as np
+from tile_data import TILE_TYPES, TILE_CODES, MOVEMENT_COSTS
+import constant as cs
+from enemy_data import ENEMY_DATA, ENEMY_SPAWN_DATA
+from turret_data import TURRET_DATA
+from pathfinding import FlowField, movement_class, label_components, a_star_search
+from corridor_graph import CorridorGraph
+from line_of_sight import compute_visibility, sight_radius
+from spatial_hash import SpatialHash
+from units import SpawnTemplate
+import map_cache
+
+# Same logger the game uses, so messages reach the log file and in-game panel when it is set up
+log = logging.getLogger("GameLogger")
+
+class TilePositions(dict):
+    """
+    Tile type -> list of (x, y) positions of that type in row-major order. A type's list is
+    only built when it is first asked for, which keeps loading large maps fast.
+    """
+    def __init__(self, tile_codes):
+        super().__init__()
+        self.tile_codes = tile_codes
+
+    def __missing__(self, tile_type):
+        if tile_type not in TILE_CODES:
+            raise KeyError(tile_type)
+        ys, xs = np.nonzero(self.tile_codes == TILE_CODES[tile_type])
+        positions = self[tile_type] = list(zip(xs.tolist(), ys.tolist()))
+        return positions
+
+    def get(self, tile_type, default=None):
+        try:
+            return self[tile_type]
+        except KeyError:
+            return default
+
+
+class MapState:
+    """
+    Game map without any graphics: terrain grid, routes, line of sight and level progress.
+    Used directly by the headless simulation; Map adds tile images and drawing on top.
+    """
+    def __init__(self, tile_size=cs.TILE_SIZE, spawn_data=ENEMY_SPAWN_DATA):
+        # Basic map state and properties
+        self.level = 1
+        self.tile_size = tile_size
+        self.tile_codes = np.zeros((0, 0), dtype=np.uint8)  # Tile type codes indexed [y, x]
+        self.cost_grids = {}  # Movement class -> float array of movement costs indexed [y, x]
+        self.components = {}  # Movement class -> region labels indexed [y, x] (see label_components)
+        self.tile_positions = {}  # Tile type -> list of (x, y) positions of that type
+        self.start_pos = None
+        self.finish_pos = None
+        self.hp = cs.HEALTH
+        self.money = cs.MONEY
+        self.width = 0  # Determined after loading a map
+        self.height = 0
+        self.spawn_data = copy.deepcopy(spawn_data)  # Own copy, endless mode grows it every wave
+        self.wave = 0  # Completed endless waves
+        self.enemy_list = []  # Sequence of enemies to spawn
+        self.spawned_enemy = 0
+        self.enemies_killed = 0
+        self.enemies_missed = 0
+        self.flow_fields = {}  # Movement class -> FlowField towards the finish tile
+        self.corridor_graphs = {}  # Movement class -> CorridorGraph of junctions and corridors
+        self.spawn_templates = {}  # Enemy type -> SpawnTemplate shared by every enemy of that type
+        self.visibility = {}  # Turret tile -> (left, top, mask) of the tiles visible from it
+        self.sight_radius = sight_radius(TURRET_DATA, tile_size)  # Tiles around a turret its visibility covers
+        self.enemy_grid = SpatialHash(tile_size)  # Live enemies bucketed by the tile they are on
+        self.turret_grid = np.full((0, 0), None, dtype=object)  # Turret standing on each tile, indexed [y, x]
+        self.terrain_version = 0  # Counts tile changes during play, so views know to redraw
+
+    def level_finished(self):
+        """
+        Return True if all enemies have been processed (killed or missed).
+        """
+        return (self.enemies_killed + self.enemies_missed) >= len(self.enemy_list)
+
+    def generate_enemy_list(self):
+        """
+        Populate enemy_list based on current level’s spawn data.
+        """
+        enemies = self.spawn_data[self.level - 1]
+        for enemy_type, count in enemies.items():
+            for _ in range(count):
+                self.enemy_list.append(enemy_type)
+
+    def reset_level(self):
+        """
+        Reset map state to prepare for a new level.
+        """
+        self.enemies_killed = 0
+        self.enemies_missed = 0
+        self.enemy_list = []
+        self.spawned_enemy = 0
+
+    def advance_endless_wave(self):
+        """
+        Count a completed endless wave and make the next one bigger.
+        """
+        self.wave += 1
+        endless_wave = self.spawn_data[3]
+        for enemy_type in ("normal", "heavy", "fast"):
+            endless_wave[enemy_type] = endless_wave.get(enemy_type, 0) + 1
+
+    def load_from_file(self, filename):
+        """
+        Load tile layout from a txt map file. The parsed grid is cached on disk (see map_cache),
+        so a map file is only parsed again after it changed.
+        """
+        self.clear_map()
+        try:
+            compiled = map_cache.load(filename, cs.MAP_CACHE_DIR) if cs.MAP_CACHE_DIR else None
+            if compiled is None:
+                map_data = self.read_map_file(filename)
+                self.height = len(map_data)
+                self.width = len(map_data[0]) if self.height > 0 else 0
+                self.build_grid_from_data(map_data)
+                if cs.MAP_CACHE_DIR:
+                    map_cache.store(filename, map_cache.CompiledMap(
+                        self.tile_codes, self.cost_grids, self.start_pos, self.finish_pos, self.components),
+                        cs.MAP_CACHE_DIR)
+            else:
+                self.apply_compiled(compiled)
+
+            self.turret_grid = np.full((self.height, self.width), None, dtype=object)
+
+            # Report broken maps now rather than with enemies stuck at the start
+            for enemy_type in self.unreachable_enemy_types():
+                log.warning(f"{filename}: finish unreachable for enemy type {enemy_type}")
+            return True
+        except Exception as e:
+            log.error(f"Error loading map from {filename}: {e}")
+            return False
+
+    def clear_map(self):
+        """
+        Clear the terrain grid and everything derived from it.
+        """
+        self.tile_codes = np.zeros((0, 0), dtype=np.uint8)
+        self.cost_grids = {}
+        self.components = {}
+        self.tile_positions = {}
+        self.start_pos = None
+        self.finish_pos = None
+        self.flow_fields = {}  # Terrain changed, cached routes are no longer valid
+        self.corridor_graphs = {}
+        self.spawn_templates = {}
+        self.visibility = {}
+        self.enemy_grid.clear()
+        self.turret_grid = np.full((0, 0), None, dtype=object)
+
+    def read_map_file(self, filename):
+        """
+        Read map file into a 2D list of tile type strings.
+        """
+        map_data = []
+        with open(filename, 'r') as file:
+            for line in file:
+                row = line.strip().split(',')
+                map_data.append(row)
+        return map_data
+
+    def build_grid_from_data(self, map_data):
+        """
+        Convert tile type strings into the compact code grid, per-class cost grids
+        and the index of tile positions by type. Unknown types become grass.
+        """
+        codes = np.full((self.height, self.width), TILE_CODES['grass'], dtype=np.uint8)
+        for y in range(self.height):
+            for x in range(min(len(map_data[y]), self.width)):
+                tile_type = map_data[y][x]
+                if tile_type not in TILE_CODES:
+                    log.warning(f"Unknown tile type: {tile_type}")
+                    continue
+                codes[y, x] = TILE_CODES[tile_type]
+        self.tile_codes = codes
+
+        # Precompute movement costs for each movement class with a lookup table per code
+        self.cost_grids = {}
+        for move_class, costs in MOVEMENT_COSTS.items():
+            table = np.array([costs.get(tile_type, float('inf')) for tile_type in TILE_TYPES])
+            self.cost_grids[move_class] = table[codes]
+        self.build_components()
+
+        self.index_tile_positions()
+        self.start_pos = self.find_tile_position('start')
+        self.finish_pos = self.find_tile_position('finish')
+
+    def apply_compiled(self, compiled):
+        """
+        Take the grid, cost grids and start and finish positions from a cached CompiledMap.
+        """
+        self.tile_codes = compiled.tile_codes
+        self.height, self.width = compiled.tile_codes.shape
+        self.cost_grids = compiled.cost_grids
+        self.components = compiled.components
+        self.index_tile_positions()
+        self.start_pos = compiled.start_pos
+        self.finish_pos = compiled.finish_pos
+
+    def build_components(self):
+        """
+        Label the connected regions of passable tiles for every movement class.
+        Classes that can walk on the same tiles share one label array.
+        """
+        self.components = {}
+        for move_class, grid in self.cost_grids.items():
+            passable = grid != float('inf')
+            for other, labels in self.components.items():
+                if np.array_equal(self.cost_grids[other] != float('inf'), passable):
+                    self.components[move_class] = labels
+                    break
+            else:
+                self.components[move_class] = label_components(passable)
+
+    def get_components(self, enemy_type):
+        """
+        Return the region labels for the enemy's movement class, relabelling if a tile change split a region.
+        """
+        move_class = movement_class(enemy_type)
+        if self.components.get(move_class) is None:
+            self.components[move_class] = label_components(self.cost_grids[move_class] != float('inf'))
+        return self.components[move_class]
+
+    def is_reachable(self, start, goal, enemy_type):
+        """
+        Return True if the enemy type can walk from start to goal (both grid positions).
+        """
+        if not (self.in_bounds(*start) and self.in_bounds(*goal)):
+            return False
+        labels = self.get_components(enemy_type)
+        region = labels[start[1], start[0]]
+        return region >= 0 and region == labels[goal[1], goal[0]]
+
+    def unreachable_enemy_types(self, enemy_types=ENEMY_DATA):
+        """
+        Return the enemy types that cannot walk from the start tile to the finish tile.
+        """
+        if self.start_pos is None or self.finish_pos is None:
+            return list(enemy_types)
+        return [enemy_type for enemy_type in enemy_types
+                if not self.is_reachable(self.start_pos, self.finish_pos, enemy_type)]
+
+    def index_tile_positions(self):
+        """
+        Index positions of every tile type, in row-major order (each type on first access).
+        """
+        self.tile_positions = TilePositions(self.tile_codes)
+
+
+    def get_tile_pos_at_position(self, x, y):
+        """
+        Given pixel coordinates, return the grid position at that location, or None if off the map.
+        """
+        tile_x = int(x // self.tile_size)
+        tile_y = int(y // self.tile_size)
+        if self.in_bounds(tile_x, tile_y):
+            return (tile_x, tile_y)
+        return None
+
+    def in_bounds(self, tile_x, tile_y):
+        """
+        Return True if the grid position lies on the map.
+        """
+        return 0 <= tile_x < self.width and 0 <= tile_y < self.height
+
+    def get_tile_type(self, tile_x, tile_y):
+        """
+        Return the tile type name at a grid position, or None if it is off the map.
+        """
+        if self.in_bounds(tile_x, tile_y):
+            return TILE_TYPES[self.tile_codes[tile_y, tile_x]]
+        return None
+
+    def place_turret(self, turret):
+        """
+        Record a turret on its tile (turret.tile_pos). The turret frees the tile again when killed.
+        """
+        tile_x, tile_y = turret.tile_pos
+        self.turret_grid[tile_y, tile_x] = turret
+        turret.map = self
+
+    def remove_turret(self, turret):
+        """
+        Free the tile of a turret, if it is still recorded there.
+        """
+        tile_x, tile_y = turret.tile_pos
+        if self.in_bounds(tile_x, tile_y) and self.turret_grid[tile_y, tile_x] is turret:
+            self.turret_grid[tile_y, tile_x] = None
+
+    def turret_at(self, tile_pos):
+        """
+        Return the turret standing on a grid position, or None.
+        """
+        if not self.in_bounds(*tile_pos):
+            return None
+        return self.turret_grid[tile_pos[1], tile_pos[0]]
+
+    def can_place_turret(self, tile_pos):
+        """
+        Return True if a turret may be built on a grid position: a free grass tile.
+        """
+        return self.get_tile_type(*tile_pos) == 'grass' and self.turret_grid[tile_pos[1], tile_pos[0]] is None
+
+    def set_tile_type(self, tile_x, tile_y, tile_type):
+        """
+        Change the terrain of one tile during play (blocking towers, destructible mountains,
+        map editing). Existing flow fields are repaired instead of rebuilt and line of sight
+        is recomputed if a mountain appeared or disappeared. Returns True if the tile changed.
+        Live enemies keep their old route until they are rerouted (see Simulation.set_tile_type).
+        """
+        old_type = self.get_tile_type(tile_x, tile_y)
+        if tile_type not in TILE_CODES:
+            log.warning(f"Unknown tile type: {tile_type}")
+            return False
+        if old_type is None or old_type == tile_type:
+            return False
+
+        # Grids from the map cache are read-only memory maps, the first change makes a private copy
+        if not self.tile_codes.flags.writeable:
+            self.tile_codes = np.array(self.tile_codes)
+        self.tile_codes[tile_y, tile_x] = TILE_CODES[tile_type]
+        for move_class, costs in MOVEMENT_COSTS.items():
+            if not self.cost_grids[move_class].flags.writeable:
+                self.cost_grids[move_class] = np.array(self.cost_grids[move_class])
+            self.cost_grids[move_class][tile_y, tile_x] = costs.get(tile_type, float('inf'))
+        self.update_components(tile_x, tile_y)
+        self.index_tile_positions()
+        self.spawn_templates = {}  # Templates hold routes that may have changed
+        self.corridor_graphs = {}  # Junctions and corridors may have changed, rebuilt on next search
+        self.terrain_version += 1
+
+        if 'mountain' in (old_type, tile_type):
+            # Only masks whose window contains the tile can change
+            self.visibility = {pos: mask for pos, mask in self.visibility.items()
+                               if max(abs(pos[0] - tile_x), abs(pos[1] - tile_y)) > self.sight_radius}
+        if {'start', 'finish'} & {old_type, tile_type}:
+            # The spawn or the goal moved, routes are built again on next use
+            self.start_pos = self.find_tile_position('start')
+            self.finish_pos = self.find_tile_position('finish')
+            self.flow_fields = {}
+        else:
+            for flow_field in self.flow_fields.values():
+                flow_field.update_tiles(self, [(tile_x, tile_y)])
+        return True
+
+    def update_components(self, tile_x, tile_y):
+        """
+        Keep the region labels in step with a changed tile. A tile that became passable joins the
+        regions around it; one that became impassable may split its region, so that class is
+        labelled again on next use.
+        """
+        for move_class, labels in list(self.components.items()):
+            if labels is None:
+                continue
+            passable = self.cost_grids[move_class][tile_y, tile_x] != float('inf')
+            if passable == (labels[tile_y, tile_x] >= 0):
+                continue
+            if not passable:
+                self.components[move_class] = None
+                continue
+
+            # Own copy: the labels may be shared with another class or be a read-only cache map
+            labels = np.array(labels)
+            neighbours = {int(labels[y, x]) for x, y in ((tile_x + 1, tile_y), (tile_x - 1, tile_y),
+                                                          (tile_x, tile_y + 1), (tile_x, tile_y - 1))
+                          if self.in_bounds(x, y) and labels[y, x] >= 0}
+            region = min(neighbours) if neighbours else int(labels.max()) + 1
+            for other in neighbours - {region}:
+                labels[labels == other] = region
+            labels[tile_y, tile_x] = region
+            self.components[move_class] = labels
+
+    def get_cost_grid(self, enemy_type):
+        """
+        Return the precomputed movement cost array for the enemy's movement class.
+        """
+        return self.cost_grids[movement_class(enemy_type)]
+
+    def get_movement_cost(self, tile_pos, enemy_type):
+        """
+        Return the cost of entering the tile at a grid position for the given enemy type.
+        """
+        return float(self.get_cost_grid(enemy_type)[tile_pos[1], tile_pos[0]])
+
+    def get_tile_center(self, tile_pos):
+        """
+        Return pixel coordinates of the centre of a grid position.
+        """
+        return (tile_pos[0] * self.tile_size + self.tile_size // 2,
+                tile_pos[1] * self.tile_size + self.tile_size // 2)
+
+    def find_tile_position(self, tile_type):
+        """
+        Return grid position of the first tile of a given type, or None if there is none.
+        """
+        positions = self.tile_positions.get(tile_type)
+        return positions[0] if positions else None
+
+    def get_flow_field(self, enemy_type):
+        """
+        Return the flow field towards the finish tile for the enemy's movement class.
+        Fields are built on first use, repaired when tiles change and reused until a new map is loaded.
+        """
+        key = movement_class(enemy_type)
+        if key not in self.flow_fields:
+            if self.finish_pos is None:
+                return None
+            self.flow_fields[key] = FlowField(self, self.finish_pos, key)
+        return self.flow_fields[key]
+
+    def get_corridor_graph(self, enemy_type):
+        """
+        Return the corridor graph for the enemy's movement class, built on first use.
+        """
+        key = movement_class(enemy_type)
+        if key not in self.corridor_graphs:
+            extra_nodes = [pos for pos in (self.start_pos, self.finish_pos) if pos]
+            self.corridor_graphs[key] = CorridorGraph(self.cost_grids[key], extra_nodes)
+        return self.corridor_graphs[key]
+
+    def find_path(self, start, goal, enemy_type):
+        """
+        Return the cheapest route from start to goal as a list of grid positions, or an empty list
+        if there is none. Searches the corridor graph, which scales with the number of junctions
+        rather than the map area; falls back to a_star_search for tiles the graph can't place.
+        Enemy routes come from the flow fields instead (see get_flow_field).
+        """
+        if start != goal and not self.is_reachable(start, goal, enemy_type):
+            return []
+        path = self.get_corridor_graph(enemy_type).find_path(start, goal)
+        return path if path is not None else a_star_search(self, start, goal, enemy_type)
+
+    def get_spawn_template(self, enemy_type, enemy_data=ENEMY_DATA):
+        """
+        Return the SpawnTemplate for an enemy type, built on first use and reused until
+        a new map is loaded (or the enemy stats table changes).
+        """
+        template = self.spawn_templates.get(enemy_type)
+        if template is None or template.enemy_data is not enemy_data:
+            template = self.spawn_templates[enemy_type] = SpawnTemplate(self, enemy_type, enemy_data)
+        return template
+
+    def set_sight_range(self, sight_range):
+        """
+        Size the visibility windows for turrets reaching sight_range pixels (the largest range in use).
+        """
+        radius = math.ceil(sight_range / self.tile_size)
+        if radius != self.sight_radius:
+            self.sight_radius = radius
+            self.visibility = {}
+
+    def get_visibility(self, tile_pos):
+        """
+        Return (left, top, mask) of the tiles visible from a grid position, within sight_radius
+        tiles of it; the mask is indexed [y - top, x - left].
+        Masks are computed once per tile and reused until a new map is loaded.
+        """
+        if tile_pos not in self.visibility:
+            # Only the window around the tile is compared, not the whole map
+            x, y = tile_pos
+            radius = self.sight_radius
+            left, top = max(x - radius, 0), max(y - radius, 0)
+            blocking = self.tile_codes[top:y + radius + 1, left:x + radius + 1] == TILE_CODES['mountain']
+            _, _, mask = compute_visibility(blocking, (x - left, y - top), radius)
+            self.visibility[tile_pos] = (left, top, mask)
+        return self.visibility[tile_pos]
+
+    def has_line_of_sight(self, from_pos, to_pos):
+        """
+        Return True if no mountain lies between two grid positions. Positions farther apart than
+        any turret can shoot are not visible.
+        """
+        if not self.in_bounds(*to_pos):
+            return True
+        left, top, mask = self.get_visibility(from_pos)
+        x, y = to_pos[0] - left, to_pos[1] - top
+        return 0 <= x < mask.shape[1] and 0 <= y < mask.shape[0] and bool(mask[y, x])
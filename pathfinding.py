@@ -1,4 +1,5 @@
 import heapq
+import numpy as np
 
 def heuristic(a, b):
     """
@@ -11,7 +12,7 @@ def a_star_search(map_obj, start, goal, enemy_type):
     A* pathfinding algorithm that considers tile movement cost and avoids impassable terrain.
     
     Arguments:
-        map_obj: The map object containing the tile grid.
+        map_obj: The map object containing the precomputed cost grids.
         start: Tuple (x, y) of the starting tile.
         goal: Tuple (x, y) of the destination tile.
         enemy_type: Type of enemy (affects movement cost, e.g., fast units move differently on marsh).
@@ -19,6 +20,9 @@ def a_star_search(map_obj, start, goal, enemy_type):
     Returns:
         A list of (x, y) positions from start to goal, or an empty list if no path is found.
     """
+    # Start and goal in different regions of passable tiles: nothing to search
+    if start != goal and not map_obj.is_reachable(start, goal, enemy_type):
+        return []
 
     open_set = []  # Priority queue for positions to evaluate
     open_set_hash = set()  # Hash set for fast lookup
@@ -30,6 +34,7 @@ def a_star_search(map_obj, start, goal, enemy_type):
     f_score = {start: heuristic(start, goal)}  # Estimated total cost
 
     closed_set = set()  # Set of positions already evaluated
+    cost_grid = map_obj.get_cost_grid(enemy_type)
 
     while open_set:
         _, current = heapq.heappop(open_set)
@@ -59,12 +64,11 @@ def a_star_search(map_obj, start, goal, enemy_type):
             if neighbor in closed_set:
                 continue
 
-            tile = map_obj.tiles[neighbor[1]][neighbor[0]]
-            movement_cost = tile.get_movement_cost(enemy_type)
+            movement_cost = cost_grid[neighbor[1], neighbor[0]]
 
-            # # Skip impassable tiles
-            # if movement_cost == float('inf'):
-            #     continue
+            # Skip impassable tiles, they never enter the open set
+            if movement_cost == float('inf'):
+                continue
 
             # Tentative score from start to neighbor
             tentative_g_score = g_score[current] + movement_cost
@@ -81,3 +85,212 @@ def a_star_search(map_obj, start, goal, enemy_type):
 
     # No path found
     return []
+
+def label_components(passable):
+    """
+    Label the 4-connected regions of passable tiles. Two tiles can only reach each other
+    if they have the same label.
+
+    Arguments:
+        passable: Boolean array indexed [y, x].
+
+    Returns:
+        An int32 array indexed [y, x] with a region number for every passable tile and -1 elsewhere.
+    """
+    height, width = passable.shape
+    labels = np.full((height, width), -1, dtype=np.int32)
+    parent = []  # Union-find forest over horizontal runs of passable tiles
+
+    def find(run):
+        while parent[run] != run:
+            parent[run] = parent[parent[run]]
+            run = parent[run]
+        return run
+
+    # Work on runs instead of single tiles, so long corridors cost one step per row
+    rows = []
+    previous = []
+    padding = np.zeros(1, dtype=np.int8)
+    for y in range(height):
+        edges = np.flatnonzero(np.diff(np.concatenate((padding, passable[y].astype(np.int8), padding))))
+        current = []
+        first = 0
+        for start, end in zip(edges[0::2].tolist(), edges[1::2].tolist()):
+            run = len(parent)
+            parent.append(run)
+            # Join every run of the row above that touches this one
+            while first < len(previous) and previous[first][1] <= start:
+                first += 1
+            index = first
+            while index < len(previous) and previous[index][0] < end:
+                root, other = find(run), find(previous[index][2])
+                if root != other:
+                    parent[max(root, other)] = min(root, other)
+                index += 1
+            current.append((start, end, run))
+        rows.append(current)
+        previous = current
+
+    region = {}  # Root run -> region number, numbered in row-major order of first appearance
+    for y, runs in enumerate(rows):
+        for start, end, run in runs:
+            labels[y, start:end] = region.setdefault(find(run), len(region))
+    return labels
+
+def movement_class(enemy_type):
+    """
+    Group enemy types that see the same tile costs.
+    Fast enemies ignore the marsh penalty, every other type moves the same way.
+    """
+    return 'fast' if enemy_type == 'fast' else 'ground'
+
+class FlowField:
+    """
+    Distance field towards a single goal tile, shared by every enemy of one movement class.
+
+    Built with one reverse Dijkstra search from the goal, so any tile can look up
+    its next step without running a separate search per enemy.
+    """
+    def __init__(self, map_obj, goal, enemy_type):
+        self.goal = goal
+        self.enemy_type = enemy_type
+        self.distance = {}   # Tile -> cost of the cheapest route to the goal
+        self.next_step = {}  # Tile -> neighbouring tile one step closer to the goal
+        self.paths = {}      # Cached full routes keyed by their starting tile
+        self.build(map_obj)
+
+    def build(self, map_obj):
+        """
+        Run a reverse Dijkstra search from the goal over all passable tiles.
+        """
+        self.distance = {self.goal: 0}
+        self.next_step = {}
+        self.paths = {}
+
+        open_set = [(0, self.goal)]
+        closed_set = set()
+        costs = map_obj.get_cost_grid(self.enemy_type).tolist()  # Plain lists index faster in the loop
+
+        while open_set:
+            current_distance, current = heapq.heappop(open_set)
+            if current in closed_set:
+                continue
+            closed_set.add(current)
+
+            # Entering a tile costs that tile's movement cost, same as in a_star_search
+            step_cost = costs[current[1]][current[0]]
+
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                neighbor = (current[0] + dx, current[1] + dy)
+
+                # Skip out-of-bounds positions
+                if (neighbor[0] < 0 or neighbor[0] >= map_obj.width or
+                    neighbor[1] < 0 or neighbor[1] >= map_obj.height):
+                    continue
+
+                if neighbor in closed_set:
+                    continue
+
+                # Enemies can never stand on impassable tiles, so they never need a route
+                if costs[neighbor[1]][neighbor[0]] == float('inf'):
+                    continue
+
+                tentative_distance = current_distance + step_cost
+                if neighbor not in self.distance or tentative_distance < self.distance[neighbor]:
+                    self.distance[neighbor] = tentative_distance
+                    self.next_step[neighbor] = current
+                    heapq.heappush(open_set, (tentative_distance, neighbor))
+
+    def update_tiles(self, map_obj, changed_tiles):
+        """
+        Repair the field after the movement cost of some tiles changed, instead of rebuilding it.
+
+        Works like LPA* rooted at the goal without a heuristic: every tile keeps its distance and
+        a one-step lookahead (the cheapest neighbour distance plus the cost of entering it). Only
+        tiles where the two disagree are expanded, so the work grows with the part of the field
+        whose routes actually changed. Returns the set of tiles whose next step was checked again.
+        """
+        inf = float('inf')
+        cost = map_obj.get_cost_grid(self.enemy_type).item  # cost(y, x) as a plain float
+        distance = self.distance
+        lookahead = {}  # Tile -> one-step lookahead distance, for tiles touched by the repair
+        open_set = []
+        expanded = set()
+
+        def neighbors(tile):
+            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                neighbor = (tile[0] + dx, tile[1] + dy)
+                if 0 <= neighbor[0] < map_obj.width and 0 <= neighbor[1] < map_obj.height:
+                    yield neighbor
+
+        def update(tile):
+            # Recompute the lookahead and queue the tile if it no longer matches the distance
+            if tile == self.goal:
+                value = 0
+            elif cost(tile[1], tile[0]) == inf:
+                value = inf  # Impassable tiles never get a route
+            else:
+                value = min((distance.get(n, inf) + cost(n[1], n[0]) for n in neighbors(tile)), default=inf)
+            lookahead[tile] = value
+            current = distance.get(tile, inf)
+            if value != current:
+                heapq.heappush(open_set, (min(value, current), tile))
+
+        for tile in changed_tiles:
+            update(tile)
+            for neighbor in neighbors(tile):
+                update(neighbor)
+
+        while open_set:
+            key, tile = heapq.heappop(open_set)
+            current = distance.get(tile, inf)
+            value = lookahead[tile]
+            if current == value or key != min(current, value):
+                continue  # Already consistent, or an outdated queue entry
+            expanded.add(tile)
+            if value < current:
+                distance[tile] = value  # A cheaper route was found
+            else:
+                del distance[tile]  # The route got more expensive or was cut, derive it again
+                update(tile)
+            for neighbor in neighbors(tile):
+                update(neighbor)
+
+        # Pick new next steps where the distances around a tile changed, keeping the old
+        # step on ties so enemies don't switch between equally good routes
+        affected = set(changed_tiles) | expanded
+        for tile in list(affected):
+            affected.update(neighbors(tile))
+        for tile in affected:
+            if tile == self.goal or tile not in distance:
+                self.next_step.pop(tile, None)
+                continue
+            best = self.next_step.get(tile)
+            best_distance = distance.get(best, inf) + cost(best[1], best[0]) if best else inf
+            for neighbor in neighbors(tile):
+                neighbor_distance = distance.get(neighbor, inf) + cost(neighbor[1], neighbor[0])
+                if neighbor_distance < best_distance:
+                    best, best_distance = neighbor, neighbor_distance
+            self.next_step[tile] = best
+
+        self.paths = {}  # Cached routes may run through the changed tiles
+        return affected
+
+    def path_from(self, start):
+        """
+        Return the route from start to the goal as a tuple of (x, y) positions,
+        or an empty tuple if the goal cannot be reached. Routes are cached and shared.
+        """
+        if start in self.paths:
+            return self.paths[start]
+
+        if start not in self.distance:
+            path = ()
+        else:
+            tiles = [start]
+            while tiles[-1] != self.goal:
+                tiles.append(self.next_step[tiles[-1]])
+            path = tuple(tiles)
+
+        self.paths[start] = path
+        return path
@@ -0,0 +1,28 @@
+import pygame as pg
+import constant as cs
+
+class RotationCache:
+    """
+    Pre-rotated copies of sprite images shared by every instance of a sprite class.
+    Angles are quantised to a fixed number of steps and each rotation is built on first use.
+    """
+    def __init__(self, images, steps=cs.ROTATION_STEPS):
+        self.images = images  # Source images by sprite type (the class-level image dictionary)
+        self.steps = steps
+        self.rotated = {}     # (sprite type, angle step) -> rotated surface
+
+    def get(self, sprite_type, angle):
+        """
+        Return the image of a sprite type rotated to the nearest quantised angle (in degrees).
+        """
+        step = round(angle * self.steps / 360) % self.steps
+        key = (sprite_type, step)
+        if key not in self.rotated:
+            self.rotated[key] = pg.transform.rotate(self.images[sprite_type], step * 360 / self.steps)
+        return self.rotated[key]
+
+    def clear(self):
+        """
+        Drop all rotated images, e.g. after the source images were reloaded.
+        """
+        self.rotated = {}
@@ -1,15 +1,53 @@
 import json
 import xml.etree.ElementTree as ET
 import os
-from pymongo import MongoClient
+import io
+import tempfile
+import threading
+import atexit
+import logging
 import datetime
+import struct
+import zlib
+import constant as cs
+
+log = logging.getLogger("GameLogger")
+
+# Process umask, read once at import (before the save writer thread starts) since reading it means setting it
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+# Writes a file atomically: write(f) fills a temporary file next to the target, which then
+# replaces the target in one step, so a crash mid-save never leaves a half-written save
+def write_atomic(file_path, write):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file as 0600; keep the permissions of the file being replaced,
+        # or give a new file the usual ones
+        try:
+            mode = os.stat(file_path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
 
 # MongoDB Save Manager for saving/loading game data from a NoSQL database
 class MongoSaveManager:
-    def __init__(self, db_name="tower_defense", collection_name="save_data"):
-        self.client = MongoClient("mongodb://localhost:27017")  # Connect to local MongoDB server
-        self.db = self.client[db_name]                         # Select database
-        self.collection = self.db[collection_name]             # Select collection
+    def __init__(self, db_name="tower_defense", collection_name="save_data", collection=None):
+        if collection is None:
+            from pymongo import MongoClient  # Optional dependency, only needed when MongoDB is used
+            self.client = MongoClient(cs.MONGO_URI, serverSelectionTimeoutMS=cs.MONGO_TIMEOUT_MS)  # Connect to the MongoDB server
+            self.db = self.client[db_name]                         # Select database
+            collection = self.db[collection_name]                  # Select collection
+        self.collection = collection
 
     def save(self, data):
         data["timestamp"] = datetime.datetime.utcnow()         # Add timestamp to sort saves later
@@ -21,6 +59,26 @@ class MongoSaveManager:
         latest = self.collection.find_one(sort=[("timestamp", -1)])
         return latest if latest else None
 
+# In-process stand-in for a MongoDB collection, supporting the calls MongoSaveManager makes
+# Lets the MongoDB save path run (e.g. in tests and benchmarks) without a database server
+class MemoryCollection:
+    def __init__(self):
+        self.documents = []
+
+    def delete_many(self, query):
+        # Only the "match everything" query is supported
+        self.documents = []
+
+    def insert_one(self, document):
+        document.setdefault("_id", len(self.documents) + 1)
+        self.documents.append(dict(document))
+
+    def find_one(self, sort=None):
+        documents = self.documents
+        for key, direction in reversed(sort or []):
+            documents = sorted(documents, key=lambda document: document.get(key), reverse=direction < 0)
+        return dict(documents[0]) if documents else None
+
 # JSON Save Manager for saving/loading game data to a JSON file
 class JSONSaveManager:
     def __init__(self, file_path="data.json"):
@@ -28,8 +86,8 @@ class JSONSaveManager:
 
     def save(self, data):
         # Save dictionary as JSON to file
-        with open(self.file_path, "w") as f:
-            json.dump(data, f, indent=4)
+        content = json.dumps(data, indent=4).encode("utf-8")
+        write_atomic(self.file_path, lambda f: f.write(content))
 
     def load(self):
         # Load data from JSON file if it exists
@@ -77,7 +135,7 @@ class XMLSaveManager:
 
         # Write XML file
         tree = ET.ElementTree(root)
-        tree.write(self.file_path, encoding="utf-8", xml_declaration=True)
+        write_atomic(self.file_path, lambda f: tree.write(f, encoding="utf-8", xml_declaration=True))
 
     def load(self):
         # Load and parse the XML file if it exists
@@ -120,7 +178,336 @@ class XMLSaveManager:
 
         return data
 
-# Instantiate global save managers for use across the project
-xml_manager = XMLSaveManager()
-json_manager = JSONSaveManager()
-mongodb_manager = MongoSaveManager()
+# Journal Save Manager: appends only what changed since the previous save as one JSON line,
+# and rewrites the file as a single full snapshot every compact_every entries
+class JournalSaveManager:
+    def __init__(self, file_path="data.journal", compact_every=cs.JOURNAL_COMPACT_EVERY):
+        self.file_path = file_path
+        self.compact_every = compact_every
+        self.state = None   # State the journal file currently replays to
+        self.entries = 0    # Delta entries written since the last snapshot
+
+    def save(self, data):
+        data = json.loads(json.dumps(data))  # Own copy in JSON form, so it compares equal to a replay
+        if self.state is None or self.entries >= self.compact_every:
+            self.compact(data)
+            return
+
+        delta = journal_delta(self.state, data)
+        if delta:
+            line = (json.dumps(delta) + "\n").encode("utf-8")
+            with open(self.file_path, "ab") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.entries += 1
+        self.state = data
+
+    def compact(self, data):
+        # Replace the whole journal with one snapshot entry
+        content = (json.dumps({"snapshot": data}) + "\n").encode("utf-8")
+        write_atomic(self.file_path, lambda f: f.write(content))
+        self.state = data
+        self.entries = 0
+
+    def load(self):
+        # Replay the journal: the last snapshot followed by the deltas written after it
+        if not os.path.exists(self.file_path):
+            return None
+
+        state = None
+        entries = 0
+        with open(self.file_path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Incomplete last line of an interrupted append, rewrite the file on the next save
+                    entries = self.compact_every
+                    break
+                if "snapshot" in entry:
+                    state, entries = entry["snapshot"], 0
+                elif state is not None:
+                    state = apply_journal_delta(state, entry)
+                    entries += 1
+
+        # Continue the journal from the replayed state
+        self.state, self.entries = state, entries
+        return json.loads(json.dumps(state)) if state is not None else None
+
+# Returns the journal entry turning state old into state new (empty if nothing changed)
+# Turrets are matched by position, so placing or upgrading one only writes that turret.
+# Turret order matters (it decides which turret fires first): turrets still in their old order
+# keep their slot, the rest are written as removed and placed again, so the replay appends them
+def journal_delta(old, new):
+    delta = {}
+    changed = {key: value for key, value in new.items()
+               if key != "turrets" and old.get(key) != value}
+    removed = [key for key in old if key not in new]
+    if changed:
+        delta["set"] = changed
+    if removed:
+        delta["unset"] = removed
+
+    if old.get("turrets") != new.get("turrets"):
+        if "turrets" not in new:
+            delta.setdefault("unset", []).append("turrets")
+        else:
+            old_turrets = {(t["x"], t["y"]): t for t in old.get("turrets", [])}
+            old_order = {pos: index for index, pos in enumerate(old_turrets)}
+            new_turrets = new["turrets"]
+
+            # Leading turrets that were already there, in the same order, stay in their slots
+            kept, last = 0, -1
+            for turret in new_turrets:
+                index = old_order.get((turret["x"], turret["y"]))
+                if index is None or index < last:
+                    break
+                kept, last = kept + 1, index
+
+            new_positions = {(t["x"], t["y"]) for t in new_turrets}
+            placed = [t for t in new_turrets[:kept] if old_turrets[(t["x"], t["y"])] != t] + new_turrets[kept:]
+            gone = [list(pos) for pos in old_turrets if pos not in new_positions]
+            gone += [[t["x"], t["y"]] for t in new_turrets[kept:] if (t["x"], t["y"]) in old_turrets]
+            if placed:
+                delta["turrets"] = placed
+            if gone:
+                delta["removed_turrets"] = gone
+            if not placed and not gone:
+                delta.setdefault("set", {})["turrets"] = new["turrets"]  # Only the order changed
+    return delta
+
+# Applies a journal_delta entry to a state and returns the new state
+def apply_journal_delta(state, delta):
+    state = dict(state)
+    for key in delta.get("unset", []):
+        state.pop(key, None)
+    state.update(delta.get("set", {}))
+
+    if "turrets" in delta or "removed_turrets" in delta:
+        # Drop removed turrets, update the remaining ones in their slots and append new ones
+        removed = {(x, y) for x, y in delta.get("removed_turrets", [])}
+        turrets = [t for t in state.get("turrets", []) if (t["x"], t["y"]) not in removed]
+        slots = {(t["x"], t["y"]): index for index, t in enumerate(turrets)}
+        for turret in delta.get("turrets", []):
+            pos = (turret["x"], turret["y"])
+            if pos in slots:
+                turrets[slots[pos]] = turret
+            else:
+                slots[pos] = len(turrets)
+                turrets.append(turret)
+        state["turrets"] = turrets
+    return state
+
+# Binary Save Manager: fixed layout built with struct, little-endian
+#   header   magic, version, flags, level, hp, money, wave, turret count, enemy count, CRC32
+#   config   mode, ip, port                         (only if the CONFIG flag is set)
+#   turrets  x, y, type, level                      (fixed-width records)
+#   enemies  type, count                            (endless spawn table)
+# The CRC32 covers the whole file with the checksum field set to 0. Records sit at fixed
+# offsets, so the header or a single turret can be read without parsing the rest.
+class BinarySaveManager:
+    MAGIC = b"TDSV"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHHHiiIIHI")
+    CONFIG = struct.Struct("<16s16sI")
+    TURRET = struct.Struct("<ii16sB3x")
+    ENEMY = struct.Struct("<16sI")
+    HAS_STATE = 1   # Flag: level, hp, money, wave and records are stored
+    HAS_CONFIG = 2  # Flag: a config record follows the header
+
+    def __init__(self, file_path="data.sav"):
+        self.file_path = file_path
+
+    def save(self, data):
+        flags = (self.HAS_STATE if "level" in data else 0) | (self.HAS_CONFIG if "config" in data else 0)
+        turrets = data.get("turrets", [])
+        enemies = data.get("enemy_data", {})
+
+        body = bytearray()
+        if flags & self.HAS_CONFIG:
+            config = data["config"]
+            body += self.CONFIG.pack(encode_name(config.get("mode") or ""), encode_name(config.get("ip") or ""),
+                                     config.get("port") or 0)
+        for turret in turrets:
+            body += self.TURRET.pack(turret["x"], turret["y"], encode_name(turret["type"]), turret["level"])
+        for enemy_type, count in enemies.items():
+            body += self.ENEMY.pack(encode_name(enemy_type), count)
+
+        fields = (self.MAGIC, self.VERSION, flags, data.get("level", 0), data.get("hp", 0),
+                  data.get("money", 0), data.get("wave", 0), len(turrets), len(enemies))
+        checksum = zlib.crc32(body, zlib.crc32(self.HEADER.pack(*fields, 0)))
+        content = self.HEADER.pack(*fields, checksum) + body
+        write_atomic(self.file_path, lambda f: f.write(content))
+
+    def read_header(self, f=None):
+        """
+        Read only the header. Returns a dict with the version, flags, level, hp, money, wave,
+        turret and enemy counts, and checksum, or None if there is no valid save file.
+        """
+        if f is None:
+            if not os.path.exists(self.file_path):
+                return None
+            with open(self.file_path, "rb") as f:
+                return self.read_header(f)
+
+        raw = f.read(self.HEADER.size)
+        if len(raw) < self.HEADER.size:
+            return None
+        magic, version, flags, level, hp, money, wave, turret_count, enemy_count, checksum = self.HEADER.unpack(raw)
+        if magic != self.MAGIC or version > self.VERSION:
+            return None
+        return {"version": version, "flags": flags, "level": level, "hp": hp, "money": money, "wave": wave,
+                "turret_count": turret_count, "enemy_count": enemy_count, "checksum": checksum}
+
+    def read_turret(self, index):
+        """
+        Read a single turret record by seeking straight to it.
+        """
+        with open(self.file_path, "rb") as f:
+            header = self.read_header(f)
+            if header is None or not 0 <= index < header["turret_count"]:
+                return None
+            offset = self.HEADER.size + (self.CONFIG.size if header["flags"] & self.HAS_CONFIG else 0)
+            f.seek(offset + index * self.TURRET.size)
+            x, y, tower_type, level = self.TURRET.unpack(f.read(self.TURRET.size))
+            return {"x": x, "y": y, "type": decode_name(tower_type), "level": level}
+
+    def load(self):
+        # Load and verify the whole file
+        if not os.path.exists(self.file_path):
+            return None
+        with open(self.file_path, "rb") as f:
+            content = f.read()
+
+        header = self.read_header(io.BytesIO(content))
+        if header is None:
+            log.error(f"{self.file_path} is not a supported save file")
+            return None
+        body = memoryview(content)[self.HEADER.size:]
+        fields = self.HEADER.unpack_from(content)[:-1]
+        if zlib.crc32(body, zlib.crc32(self.HEADER.pack(*fields, 0))) != header["checksum"]:
+            log.error(f"{self.file_path} is damaged (checksum mismatch)")
+            return None
+
+        data = {}
+        offset = 0
+        if header["flags"] & self.HAS_CONFIG:
+            mode, ip, port = self.CONFIG.unpack_from(body, offset)
+            data["config"] = {"mode": decode_name(mode), "ip": decode_name(ip) or None, "port": port or None}
+            offset += self.CONFIG.size
+        if header["flags"] & self.HAS_STATE:
+            data.update({key: header[key] for key in ("level", "hp", "money", "wave")})
+            data["turrets"] = []
+            for x, y, tower_type, level in self.TURRET.iter_unpack(body[offset:offset + header["turret_count"] * self.TURRET.size]):
+                data["turrets"].append({"x": x, "y": y, "type": decode_name(tower_type), "level": level})
+            offset += header["turret_count"] * self.TURRET.size
+            data["enemy_data"] = {decode_name(enemy_type): count for enemy_type, count
+                                  in self.ENEMY.iter_unpack(body[offset:offset + header["enemy_count"] * self.ENEMY.size])}
+        return data
+
+# Encodes a name into a fixed-width 16 byte field (struct would silently cut longer names)
+def encode_name(name):
+    encoded = str(name).encode("ascii")
+    if len(encoded) > 16:
+        raise ValueError(f"Name too long for binary save: {name}")
+    return encoded
+
+def decode_name(raw):
+    return raw.rstrip(b"\0").decode("ascii")
+
+# Writes saves to several managers on a background thread so the game loop never waits for disk or database
+# Save managers are picked by backend name and only written to while enabled
+class SaveService:
+    def __init__(self, backends):
+        self.backends = list(backends)  # Names of the enabled backends
+        self.pending = None        # Newest snapshot not yet picked up by the worker
+        self.writing = False       # True while the worker writes a snapshot
+        self.coalesced = 0         # Snapshots replaced by a newer one before they were written
+        self.condition = threading.Condition()
+        self.thread = None         # Worker thread, started on the first save
+
+    def save(self, data):
+        """
+        Queue a snapshot for writing and return immediately. The service takes ownership of data,
+        so it must not be changed afterwards. A snapshot still waiting is replaced, as the newer
+        one holds the complete state.
+        """
+        with self.condition:
+            if self.pending is not None:
+                self.coalesced += 1
+            self.pending = data
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="SaveService", daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.pending is None:
+                    self.condition.wait()
+                data, self.pending = self.pending, None
+                self.writing = True
+
+            for name in list(self.backends):
+                try:
+                    # Managers are created here on first use, so connecting never blocks the game loop
+                    get_manager(name).save(dict(data))  # Managers may add keys (e.g. MongoDB's timestamp and _id)
+                except Exception as e:
+                    log.error(f"Saving to {name} failed: {e}")
+
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def set_backends(self, backends):
+        """
+        Choose which backends later saves are written to.
+        """
+        self.backends = [name for name in backends if name in SAVE_BACKENDS]
+
+    def flush(self, timeout=None):
+        """
+        Block until every queued snapshot is written. Returns False if the timeout ran out first.
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: self.pending is None and not self.writing, timeout)
+
+
+# Registry of save backends: name -> (label shown in menus, factory creating its manager)
+SAVE_BACKENDS = {}
+_hidden_backends = set()  # Backends for tests and benchmarks, usable by name but not offered to players
+_managers = {}  # Managers created so far, by backend name
+_managers_lock = threading.Lock()
+
+def register_backend(name, label, factory, hidden=False):
+    SAVE_BACKENDS[name] = (label, factory)
+    if hidden:
+        _hidden_backends.add(name)
+    else:
+        _hidden_backends.discard(name)
+
+# Returns the manager of a backend, creating it on first use
+def get_manager(name):
+    with _managers_lock:
+        if name not in _managers:
+            _managers[name] = SAVE_BACKENDS[name][1]()
+        return _managers[name]
+
+# (name, label) pairs of the registered backends players can pick, for menus
+def backend_choices():
+    return [(name, label) for name, (label, _) in SAVE_BACKENDS.items() if name not in _hidden_backends]
+
+register_backend("json", "JSON", JSONSaveManager)
+register_backend("xml", "XML", XMLSaveManager)
+register_backend("mongo", "MongoDB", MongoSaveManager)
+register_backend("journal", "Journal", JournalSaveManager)
+register_backend("binary", "Binary", BinarySaveManager)
+# Saves only live as long as the process, so it is never offered in the config dialog or as a Continue source
+register_backend("mongo_memory", "MongoDB (in memory)", lambda: MongoSaveManager(collection=MemoryCollection()),
+                 hidden=True)
+
+# Saves go to the enabled backends through the background writer
+save_service = SaveService(cs.SAVE_BACKENDS)
+atexit.register(save_service.flush, cs.SAVE_FLUSH_TIMEOUT)  # Also when the game is closed from a menu or popup
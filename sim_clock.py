@@ -0,0 +1,49 @@
+import constant as cs
+
+class SimulationClock:
+    """
+    Fixed-timestep clock for game logic, decoupled from the rendering frame rate.
+
+    Real frame durations are collected in an accumulator and converted into a whole
+    number of fixed ticks, so the simulation advances by the same steps no matter
+    how fast frames are drawn.
+    """
+    def __init__(self, tick_rate=cs.SIM_TICK_RATE, max_ticks_per_frame=cs.MAX_SIM_TICKS_PER_FRAME):
+        self.tick_ms = 1000 / tick_rate  # Length of one simulation tick in milliseconds
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0  # Real time not yet simulated, in milliseconds
+        self.ticks = 0  # Ticks simulated so far
+
+    @property
+    def time(self):
+        """
+        Simulation time in milliseconds (replaces pg.time.get_ticks for game logic).
+        """
+        return self.ticks * self.tick_ms
+
+    def advance(self, frame_ms):
+        """
+        Add a real frame duration and return how many ticks should be simulated for it.
+        Backlog beyond max_ticks_per_frame is dropped so a stalled frame cannot
+        snowball into ever longer catch-up frames.
+        """
+        self.accumulator += frame_ms
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > self.max_ticks_per_frame:
+            ticks = self.max_ticks_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_ms
+        return ticks
+
+    def step(self):
+        """
+        Advance simulation time by one tick.
+        """
+        self.ticks += 1
+
+    def reset_accumulator(self):
+        """
+        Forget unsimulated real time, e.g. after a blocking popup paused the game.
+        """
+        self.accumulator = 0.0
@@ -0,0 +1,209 @@
+import constant as cs
+from enemy_data import ENEMY_DATA, ENEMY_SPAWN_DATA
+from turret_data import TURRET_DATA
+from level_data import LEVEL_DATA
+from map_state import MapState
+from units import EnemyUnit, TurretUnit, UnitGroup
+from sim_clock import SimulationClock
+from batch_targeting import batch_targets
+
+class Simulation:
+    """
+    Headless game loop: spawns waves, moves enemies and fires turrets in fixed ticks.
+
+    Needs no display or assets. The pygame front end runs the same simulation with
+    its sprite classes as factories and sprite groups as containers, and only draws.
+    """
+    def __init__(self, game_map, enemy_group=None, turret_group=None,
+                 enemy_factory=EnemyUnit, turret_factory=TurretUnit,
+                 enemy_data=ENEMY_DATA, turret_data=TURRET_DATA, targeting_mode=None):
+        self.map = game_map
+        self.enemies = enemy_group if enemy_group is not None else UnitGroup()
+        self.turrets = turret_group if turret_group is not None else UnitGroup()
+        self.enemy_factory = enemy_factory    # Called as factory(map, enemy_type, enemy_data)
+        self.turret_factory = turret_factory  # Called as factory(pos, tower_type, tile_pos, turret_data)
+        self.enemy_data = enemy_data
+        self.turret_data = turret_data
+        game_map.set_sight_range(max(stats["range"] for stats in turret_data.values()))
+        self.targeting_mode = targeting_mode or cs.TARGETING_MODE
+
+        self.clock = SimulationClock()
+        self.last_enemy_spawn = self.clock.time
+        self.wave_active = False  # True while the current wave is spawning or being fought
+        self.outcome = 0  # 1 once the final story level is won
+
+    def add_turret(self, tile_pos, tower_type, level=1):
+        """
+        Place a turret on a grid position (no cost is charged) and return it.
+        Raises ValueError if the position is off the map, not grass or already taken.
+        """
+        if not self.map.in_bounds(*tile_pos):
+            raise ValueError(f"Turret position {tile_pos} is off the map")
+        if not self.map.can_place_turret(tile_pos):
+            raise ValueError(f"Cannot place a turret on {tile_pos}: the tile is not free grass")
+        turret = self.turret_factory(self.map.get_tile_center(tile_pos), tower_type, tile_pos, self.turret_data)
+        for _ in range(1, level):
+            turret.upgrade()
+        self.turrets.add(turret)
+        self.map.place_turret(turret)
+        self.map.get_visibility(tile_pos)  # Precompute line of sight for the new turret
+        return turret
+
+    def set_tile_type(self, tile_pos, tile_type):
+        """
+        Change a tile's terrain mid-wave and move every live enemy onto the repaired routes.
+        Returns True if the tile changed.
+        """
+        if not self.map.set_tile_type(tile_pos[0], tile_pos[1], tile_type):
+            return False
+        for enemy in list(self.enemies):  # Enemies cut off from the finish leave the group
+            enemy.reroute()
+        return True
+
+    def start_wave(self):
+        """
+        Start spawning the current wave.
+        """
+        self.wave_active = True
+
+    def step(self):
+        """
+        Advance the game by one simulation tick.
+        """
+        self.clock.step()
+        current_time = self.clock.time
+
+        self.enemies.update()
+        self.update_turrets(current_time)
+
+        if self.wave_active:
+            self.spawn_enemies(current_time)
+
+    def update_turrets(self, current_time):
+        """
+        Let every turret whose cooldown has passed pick a target and fire.
+        """
+        if self.targeting_mode == "batch":
+            # Match every ready turret against all enemies in one vectorised pass
+            ready_turrets = [turret for turret in self.turrets if turret.ready_to_fire(current_time)]
+            for turret, target in batch_targets(ready_turrets, self.enemies):
+                turret.engage(target, current_time)
+        else:
+            # Each turret only looks at enemies near it through the map's spatial index
+            for turret in self.turrets:
+                turret.update(self.enemies, current_time, self.map.enemy_grid)
+
+    def spawn_enemies(self, current_time):
+        """
+        Spawn the next enemy of the wave once the spawn delay has passed.
+        """
+        if current_time - self.last_enemy_spawn > cs.SPAWN_RATE:
+            if self.map.spawned_enemy < len(self.map.enemy_list):
+                enemy_type = self.map.enemy_list[self.map.spawned_enemy]
+                enemy = self.enemy_factory(self.map, enemy_type, self.enemy_data)
+                self.enemies.add(enemy)
+                self.map.spawned_enemy += 1
+                self.last_enemy_spawn = current_time
+
+    def is_game_over(self):
+        """
+        Return True once the base has no health left.
+        """
+        return self.map.hp <= 0
+
+    def wave_finished(self):
+        """
+        Return True once every enemy of the wave was killed or got through.
+        """
+        return self.map.level_finished()
+
+    def complete_wave(self, level_data=LEVEL_DATA):
+        """
+        Apply the end-of-wave rules: reward, next story map or a bigger endless wave.
+        Returns the level_data entry of the finished level (None if there is none).
+        """
+        game_map = self.map
+        game_map.reset_level()
+        game_map.money += cs.LEVEL_COMPLETE_REWARD
+        self.wave_active = False
+        level_info = level_data.get(game_map.level)
+
+        if level_info and game_map.level != 4:
+            if level_info.get("reset_turrets"):
+                for turret in self.turrets:
+                    turret.delete_turret()
+
+            if level_info.get("end_game"):
+                self.outcome = 1
+                return level_info
+
+            game_map.load_from_file(level_info["map"])
+            game_map.level += 1
+            # Turrets kept for the next map stand on its fresh turret grid, if their tile still takes a turret
+            for turret in list(self.turrets):
+                if game_map.can_place_turret(turret.tile_pos):
+                    game_map.place_turret(turret)
+                else:
+                    turret.delete_turret()
+        elif game_map.level == 4:
+            game_map.advance_endless_wave()
+
+        game_map.generate_enemy_list()
+        return level_info
+
+
+def run_simulation(map_file, turret_layout, level=1, wave=0, max_ticks=100000,
+                   enemy_data=ENEMY_DATA, turret_data=TURRET_DATA, spawn_data=ENEMY_SPAWN_DATA,
+                   hp=cs.HEALTH, money=cs.MONEY, targeting_mode=None):
+    """
+    Play one wave headlessly, as fast as possible, and return its outcome.
+
+    Arguments:
+        map_file: Path to a txt map file.
+        turret_layout: Iterable of (tile_x, tile_y, tower_type) or (tile_x, tile_y, tower_type, level).
+                       Turrets are placed for free, on free grass tiles only (ValueError otherwise).
+        level: Story level 1-3, or 4 for endless mode.
+        wave: Number of endless waves already survived (ignored for story levels).
+        max_ticks: Stop after this many simulation ticks.
+        enemy_data, turret_data, spawn_data: Stat tables, defaults are the game's own.
+        hp, money: Starting health and money.
+        targeting_mode: "sprite" or "batch", defaults to constant.TARGETING_MODE.
+
+    Returns:
+        Dict with outcome ("won", "lost" or "timeout"), leaks, kills, money, hp and ticks.
+    """
+    game_map = MapState(spawn_data=spawn_data)
+    if not game_map.load_from_file(map_file):
+        raise ValueError(f"Could not load map {map_file}")
+    game_map.level = level
+    game_map.hp = hp
+    game_map.money = money
+    if level == 4:
+        for _ in range(wave):
+            game_map.advance_endless_wave()
+    game_map.generate_enemy_list()
+
+    simulation = Simulation(game_map, enemy_data=enemy_data, turret_data=turret_data,
+                            targeting_mode=targeting_mode)
+    for tile_x, tile_y, tower_type, *upgrade_level in turret_layout:
+        simulation.add_turret((tile_x, tile_y), tower_type, *upgrade_level)
+
+    simulation.start_wave()
+    outcome = "timeout"
+    while simulation.clock.ticks < max_ticks:
+        simulation.step()
+        if simulation.is_game_over():
+            outcome = "lost"
+            break
+        if simulation.wave_finished():
+            outcome = "won"
+            break
+
+    return {
+        "outcome": outcome,
+        "leaks": game_map.enemies_missed,
+        "kills": game_map.enemies_killed,
+        "money": game_map.money,
+        "hp": game_map.hp,
+        "ticks": simulation.clock.ticks,
+    }
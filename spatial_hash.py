@@ -0,0 +1,86 @@
+import math
+
+class SpatialHash:
+    """
+    Uniform grid index of moving objects, bucketed by the cell their centre lies in.
+    Used to find enemies near a point without scanning every enemy.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.buckets = {}  # Cell (x, y) -> dict of items in that cell (kept in insertion order)
+        self.cells = {}    # Item -> cell it is currently stored in
+
+    def cell_at(self, pos):
+        """
+        Return the cell that contains pixel coordinates pos.
+        """
+        return (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+
+    def insert(self, item, pos):
+        """
+        Add an item at pixel coordinates pos (moves it if it is already indexed).
+        """
+        if item in self.cells:
+            self.move(item, pos)
+            return
+        cell = self.cell_at(pos)
+        self.buckets.setdefault(cell, {})[item] = None
+        self.cells[item] = cell
+
+    def move(self, item, pos):
+        """
+        Update an item's position. Only touches the buckets when it crosses into another cell.
+        """
+        cell = self.cell_at(pos)
+        old_cell = self.cells.get(item)
+        if old_cell == cell:
+            return
+        if old_cell is not None:
+            self._discard(item, old_cell)
+        self.buckets.setdefault(cell, {})[item] = None
+        self.cells[item] = cell
+
+    def remove(self, item):
+        """
+        Remove an item from the index if it is present.
+        """
+        cell = self.cells.pop(item, None)
+        if cell is not None:
+            self._discard(item, cell)
+
+    def _discard(self, item, cell):
+        bucket = self.buckets[cell]
+        del bucket[item]
+        if not bucket:
+            del self.buckets[cell]
+
+    def clear(self):
+        """
+        Remove every item from the index.
+        """
+        self.buckets = {}
+        self.cells = {}
+
+    def query_circle(self, center, radius):
+        """
+        Yield items in every cell that overlaps the circle. Items may still lie
+        slightly outside the circle, so callers should check the exact distance.
+        """
+        size = self.cell_size
+        min_x, min_y = self.cell_at((center[0] - radius, center[1] - radius))
+        max_x, max_y = self.cell_at((center[0] + radius, center[1] + radius))
+
+        for cell_y in range(min_y, max_y + 1):
+            # Distance along y from the centre to the nearest edge of this row of cells
+            nearest_y = min(max(center[1], cell_y * size), (cell_y + 1) * size)
+            for cell_x in range(min_x, max_x + 1):
+                bucket = self.buckets.get((cell_x, cell_y))
+                if not bucket:
+                    continue
+                nearest_x = min(max(center[0], cell_x * size), (cell_x + 1) * size)
+                if math.dist(center, (nearest_x, nearest_y)) > radius:
+                    continue
+                yield from bucket
+
+    def __len__(self):
+        return len(self.cells)
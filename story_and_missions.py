@@ -1,4 +1,5 @@
 import pygame as pg
+from text_cache import text_cache
 
 class StoryManager:
     def __init__(self, screen, font): 
@@ -54,13 +55,13 @@ class StoryManager:
             start_y = popup_rect.centery - total_text_height // 2
             
             for i, line in enumerate(wrapped_lines):
-                text_surface = self.font.render(line, True, (0, 0, 0))
+                text_surface = text_cache.render(self.font, line, (0, 0, 0))
                 text_rect = text_surface.get_rect(centerx=popup_rect.centerx, 
                                                   top=start_y + i * line_height)
                 self.screen.blit(text_surface, text_rect)
             
             # Draw OK button text
-            btn_text = self.font.render("OK", True, (255, 255, 255))
+            btn_text = text_cache.render(self.font, "OK", (255, 255, 255))
             btn_rect = btn_text.get_rect(center=button_rect.center)
             self.screen.blit(btn_text, btn_rect)
             
@@ -95,6 +96,7 @@ class MissionManager:
         self.current_mission = ""
         self.mission_active = False
         self.reward_given = False
+        self.mission_surface = None  # Semi-transparent mission box, created on first draw
 
     def set_mission(self, mission_text):
         """
@@ -122,16 +124,18 @@ class MissionManager:
     def draw_mission(self, screen, font):
         """
         Render the mission text in a transparent box on the screen.
+        Returns the updated rect, or None if there is no mission to show.
         """
         if not self.mission_active or not self.current_mission:
-            return
+            return None
 
-        mission_surface = pg.Surface((300, 50), pg.SRCALPHA)
-        mission_surface.fill((100, 100, 100, 100))  # semi-transparent background
+        if self.mission_surface is None:
+            self.mission_surface = pg.Surface((300, 50), pg.SRCALPHA)
+            self.mission_surface.fill((100, 100, 100, 100))  # semi-transparent background
 
         mission_text = f"Mission: {self.current_mission}"
-        text_render = font.render(mission_text, True, (255, 255, 255))
+        text_render = text_cache.render(font, mission_text, (255, 255, 255))
         text_rect = text_render.get_rect(topleft=(10, 10))
 
-        screen.blit(mission_surface, (0, 0))
-        screen.blit(text_render, text_rect)
+        box_rect = screen.blit(self.mission_surface, (0, 0))
+        return box_rect.union(screen.blit(text_render, text_rect))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the game modules from the project root, wherever pytest is started from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,24 @@
+import numpy as np
+from corridor_graph import CorridorGraph
+
+INF = float('inf')
+
+
+def test_loop_without_junctions_is_searchable():
+    # A ring of walkable tiles around an impassable centre: every tile has two walkable neighbours
+    cost_grid = np.array([
+        [1.0, 1.0, 1.0],
+        [1.0, INF, 2.0],
+        [1.0, 1.0, 1.0],
+    ])
+    graph = CorridorGraph(cost_grid)
+
+    assert len(graph.nodes) == 1
+    path = graph.find_path((0, 1), (2, 1))
+    assert path[0] == (0, 1) and path[-1] == (2, 1)
+    assert len(path) == 5
+    # Both ways round are four steps; either way the path only steps between neighbouring tiles
+    assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+
+    # The cheaper way round avoids the costly tile
+    assert (2, 1) not in graph.find_path((1, 0), (1, 2))[1:-1]
@@ -0,0 +1,69 @@
+import pytest
+import constant as cs
+from map_state import MapState
+from simulation import Simulation
+from units import EnemyUnit
+
+# Two ways from the corridor at the top to the finish: straight on, or down and around
+MAP = [
+    "start,path,path,path,finish",
+    "grass,path,grass,path,grass",
+    "grass,path,path,path,grass",
+]
+
+
+@pytest.fixture
+def simulation(tmp_path, monkeypatch):
+    monkeypatch.setattr(cs, "MAP_CACHE_DIR", None)
+    map_file = tmp_path / "map.txt"
+    map_file.write_text("\n".join(MAP) + "\n")
+    game_map = MapState()
+    assert game_map.load_from_file(str(map_file))
+    return Simulation(game_map)
+
+
+def place_enemy(simulation, tile, path_index):
+    """Spawn a normal enemy standing on tile, heading for the tile at path_index - 1 of its route."""
+    game_map = simulation.map
+    enemy = EnemyUnit(game_map, "normal")
+    enemy.current_path_index = path_index
+    enemy.current_target = game_map.get_tile_center(enemy.path[path_index - 1])
+    enemy.center = game_map.get_tile_center(tile)
+    game_map.enemy_grid.move(enemy, enemy.center)
+    simulation.enemies.add(enemy)
+    return enemy
+
+
+def walk_out(enemy, max_ticks=10000):
+    for _ in range(max_ticks):
+        if not enemy.active:
+            return True
+        enemy.move()
+    return False
+
+
+def test_enemy_on_blocked_tile_walks_onto_new_route(simulation):
+    game_map = simulation.map
+    enemy = place_enemy(simulation, (1, 0), 3)  # On (1, 0), heading for (2, 0)
+
+    # Wall in the tile the enemy stands on and the one it heads for
+    assert simulation.set_tile_type((1, 0), "mountain")
+    assert simulation.set_tile_type((2, 0), "mountain")
+
+    assert enemy.current_target == game_map.get_tile_center((1, 1))
+    assert walk_out(enemy)
+    assert game_map.enemies_missed == 1
+    assert enemy.path[-1] == game_map.finish_pos
+
+
+def test_enemy_cut_off_from_finish_leaks(simulation):
+    game_map = simulation.map
+    hp = game_map.hp
+    enemy = place_enemy(simulation, (0, 0), 1)  # Just spawned on the start tile
+
+    assert simulation.set_tile_type((1, 0), "mountain")
+
+    assert not enemy.active
+    assert enemy not in simulation.enemies
+    assert game_map.enemies_missed == 1
+    assert game_map.hp == hp - 1
@@ -0,0 +1,30 @@
+from save_and_load import JSONSaveManager, JournalSaveManager
+
+
+def turret(x, y, tower_type="tower_1", level=1):
+    return {"x": x, "y": y, "type": tower_type, "level": level}
+
+
+def save_all(managers, data):
+    for manager in managers:
+        manager.save(dict(data))
+
+
+def test_journal_replays_turret_order_after_delete_and_place(tmp_path):
+    json_manager = JSONSaveManager(str(tmp_path / "data.json"))
+    journal = JournalSaveManager(str(tmp_path / "data.journal"))
+    managers = [json_manager, journal]
+
+    save_all(managers, {"level": 1, "money": 500, "turrets": [turret(1, 1), turret(2, 1), turret(3, 1)]})
+    # Upgrade one turret in place, then delete the first one and build a new one on its tile
+    save_all(managers, {"level": 1, "money": 400, "turrets": [turret(1, 1), turret(2, 1, "tower_1_upgrade", 2),
+                                                              turret(3, 1)]})
+    save_all(managers, {"level": 1, "money": 300, "turrets": [turret(2, 1, "tower_1_upgrade", 2), turret(3, 1),
+                                                              turret(1, 1, "tower_2")]})
+
+    expected = json_manager.load()
+    assert [(t["x"], t["y"], t["type"]) for t in expected["turrets"]] == \
+        [(2, 1, "tower_1_upgrade"), (3, 1, "tower_1"), (1, 1, "tower_2")]
+    assert JournalSaveManager(str(tmp_path / "data.journal")).load() == expected
+    with open(tmp_path / "data.journal") as f:
+        assert len(f.readlines()) == 3  # One snapshot and two change entries, not rewritten as snapshots
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+import constant as cs
+from map_state import MapState
+from simulation import Simulation
+
+MAP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "maps", "endless_level.txt")
+
+
+@pytest.fixture
+def simulation(monkeypatch):
+    monkeypatch.setattr(cs, "MAP_CACHE_DIR", None)
+    game_map = MapState()
+    assert game_map.load_from_file(MAP_FILE)
+    return Simulation(game_map)
+
+
+def test_turret_grid_follows_place_and_delete(simulation):
+    game_map = simulation.map
+    tile_pos = game_map.tile_positions["grass"][0]
+
+    turret = simulation.add_turret(tile_pos, "tower_1", 2)
+    assert game_map.turret_at(tile_pos) is turret
+    assert not game_map.can_place_turret(tile_pos)
+
+    turret.delete_turret()
+    assert game_map.turret_at(tile_pos) is None
+    assert game_map.can_place_turret(tile_pos)
+
+
+@pytest.mark.parametrize("tile_pos", [(-1, 0), (0, -1), (10 ** 4, 0)])
+def test_add_turret_rejects_positions_off_the_map(simulation, tile_pos):
+    with pytest.raises(ValueError):
+        simulation.add_turret(tile_pos, "tower_1")
+
+
+def test_add_turret_rejects_taken_and_non_grass_tiles(simulation):
+    game_map = simulation.map
+    tile_pos = game_map.tile_positions["grass"][0]
+    simulation.add_turret(tile_pos, "tower_1")
+
+    with pytest.raises(ValueError):
+        simulation.add_turret(tile_pos, "tower_2")
+    with pytest.raises(ValueError):
+        simulation.add_turret(game_map.tile_positions["path"][0], "tower_1")
+    assert len(list(simulation.turrets)) == 1
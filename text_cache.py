@@ -0,0 +1,47 @@
+from collections import OrderedDict
+import constant as cs
+
+class TextCache:
+    """
+    Bounded cache of rendered text surfaces keyed by (font, text, colour, antialias).
+
+    Rendering text rasterises every glyph, while most HUD and menu text stays the same
+    for many frames. When the cache is full the least recently used surface is dropped.
+    Cached surfaces are shared, so callers must only blit them and never draw on them.
+    """
+    def __init__(self, max_size=cs.TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()  # key -> surface, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """
+        Return the surface of text rendered with font, rendering it only on a cache miss.
+        """
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)  # Evict the least recently used entry
+        return surface
+
+    def clear(self):
+        """
+        Drop all cached surfaces.
+        """
+        self.surfaces.clear()
+
+    def __len__(self):
+        return len(self.surfaces)
+
+
+# Shared cache used by all UI drawing code
+text_cache = TextCache()
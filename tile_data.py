@@ -0,0 +1,38 @@
+# Terrain configuration
+# TILE_TYPES lists every known tile type. A tile's index in this list is the
+# compact uint8 code stored in Map.tile_codes, so new types must be appended.
+TILE_TYPES = [
+    "grass",
+    "path",
+    "mountain",
+    "forest",
+    "marsh",
+    "start",
+    "finish",
+]
+
+# Lookup from tile type name to its code
+TILE_CODES = {tile_type: code for code, tile_type in enumerate(TILE_TYPES)}
+
+# Movement cost of entering each tile type, per movement class
+# Lower values = faster movement, 'inf' means impassable (also used for unknown types)
+MOVEMENT_COSTS = {
+    "ground": {
+        "path": 1.0,            # Normal movement
+        "start": 1.0,           # Spawn point
+        "finish": 1.0,          # Goal point
+        "marsh": 2.0,           # Slows most enemies
+        "grass": float("inf"),  # Cannot be walked on
+        "forest": float("inf"),
+        "mountain": float("inf")
+    },
+    "fast": {
+        "path": 1.0,
+        "start": 1.0,
+        "finish": 1.0,
+        "marsh": 1.0,           # Fast enemies ignore marsh penalty
+        "grass": float("inf"),
+        "forest": float("inf"),
+        "mountain": float("inf")
+    }
+}
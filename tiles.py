@@ -1,4 +1,6 @@
 import pygame as pg
+from tile_data import MOVEMENT_COSTS
+from pathfinding import movement_class
 
 class Tile(pg.sprite.Sprite):
     def __init__(self, x, y, image, tile_type):
@@ -17,19 +19,5 @@ class Tile(pg.sprite.Sprite):
         Returns the movement cost for a tile based on its type and the enemy type.
         Lower values = faster movement. 'inf' means impassable.
         """
-        costs = {
-            'path': 1.0,           # Normal movement
-            'start': 1.0,          # Spawn point
-            'finish': 1.0,         # Goal point
-            'marsh': 2.0,          # Slows most enemies
-            'grass': float('inf'), # Cannot be walked on
-            'forest': float('inf'),
-            'mountain': float('inf')
-        }
-
-        # Exception: fast enemies ignore marsh penalty
-        if self.tile_type == 'marsh' and enemy_type == 'fast':
-            return 1.0
-
         # Return standard cost, or inf if unknown tile
-        return costs.get(self.tile_type, float('inf'))
+        return MOVEMENT_COSTS[movement_class(enemy_type)].get(self.tile_type, float('inf'))
@@ -2,7 +2,7 @@
 # Each key represents a turret type or its upgraded version.
 # Values are dictionaries defining:
 # - range: radius of attack area (in pixels)
-# - attack_speed: time between shots (in milliseconds)
+# - attack_speed: time between shots (in milliseconds of simulation time)
 # - damage: how much HP is subtracted per hit
 
 TURRET_DATA = {
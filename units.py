@@ -0,0 +1,304 @@
+import math
+import itertools
+import constant as cs
+from enemy_data import ENEMY_DATA
+from turret_data import TURRET_DATA
+
+class UnitGroup:
+    """
+    Ordered collection of units offering the parts of pg.sprite.Group the simulation uses,
+    so headless runs need no pygame. Units remove themselves from it when killed.
+    """
+    def __init__(self):
+        self.units = {}  # Unit -> None, a dict keeps insertion order like a sprite group
+
+    def add(self, *units):
+        for unit in units:
+            self.units[unit] = None
+            unit.unit_groups.add(self)
+
+    def remove(self, *units):
+        for unit in units:
+            self.units.pop(unit, None)
+            unit.unit_groups.discard(self)
+
+    def update(self, *args):
+        for unit in list(self.units):
+            unit.update(*args)
+
+    def empty(self):
+        self.remove(*self.units)
+
+    def __iter__(self):
+        return iter(list(self.units))
+
+    def __contains__(self, unit):
+        return unit in self.units
+
+    def __len__(self):
+        return len(self.units)
+
+
+class SpawnTemplate:
+    """
+    Everything that is the same for all enemies of one type spawning on one map: stats,
+    start position and the shared route. Built once per map and enemy type by
+    MapState.get_spawn_template, so a new enemy only sets up its own state.
+    """
+    def __init__(self, map_obj, enemy_type, enemy_data=ENEMY_DATA):
+        enemy_stats = enemy_data[enemy_type]
+        self.enemy_type = enemy_type
+        self.enemy_data = enemy_data  # Stats table the template was built from
+        self.hp = enemy_stats["hp"]
+        self.speed = enemy_stats["speed"]
+
+        self.start_pos = map_obj.start_pos
+        self.center = map_obj.get_tile_center(self.start_pos) if self.start_pos else (0, 0)
+
+        # Immutable route shared by every enemy of this type, empty if the finish can't be reached
+        self.path = ()
+        flow_field = map_obj.get_flow_field(enemy_type)
+        if self.start_pos and flow_field:
+            self.path = flow_field.path_from(self.start_pos)
+        self.first_target = map_obj.get_tile_center(self.path[0]) if self.path else None
+
+
+class EnemyUnit:
+    """
+    Enemy game logic without graphics: stats, route following, movement and death.
+    The pygame Enemy sprite adds its image on top.
+    """
+    # Increasing spawn counter, used to break targeting ties in spawn order
+    spawn_counter = itertools.count()
+
+    def __init__(self, map_obj, enemy_type, enemy_data=ENEMY_DATA):
+        # Stats, start point and route are shared by all enemies of this type on the map,
+        # only hp, position and progress along the route are per enemy
+        template = map_obj.get_spawn_template(enemy_type, enemy_data)
+        self.map = map_obj
+        self.hp = template.hp
+        self.speed = template.speed
+        self.enemy_type = enemy_type
+
+        self.start_pos = template.start_pos
+        self.path = template.path
+        self.current_target = template.first_target  # Centre of the start tile, the first route step
+        self.current_path_index = 1 if template.path else 0
+        self.spawn_order = next(EnemyUnit.spawn_counter)
+
+        self.center = template.center  # Position in pixels
+        self.angle = 0.0  # Direction of travel in degrees
+        self.active = True  # False once killed or through the finish
+        self.unit_groups = set()  # UnitGroups holding this enemy
+
+        # Register in the map's spatial index so turrets can find nearby enemies
+        self.map.enemy_grid.insert(self, self.center)
+
+    def reroute(self):
+        """
+        Switch to the map's repaired route after the terrain changed. Tiles already walked are
+        kept, so the progress along the path that turrets target by stays the same.
+        An enemy cut off from the finish leaves the map as if it got through, so the wave still ends.
+        """
+        flow_field = self.map.get_flow_field(self.enemy_type)
+        if not flow_field or not self.current_target:
+            return
+        walked = self.path[:self.current_path_index - 1]
+
+        # Keep walking to the tile the enemy is heading for, unless it has no route any more
+        route = flow_field.path_from(self.path[self.current_path_index - 1])
+        if not route:
+            route = self.nearest_route(flow_field)
+            if not route:
+                self.leak()
+                return
+            self.current_target = self.map.get_tile_center(route[0])
+        self.path = walked + route
+
+    def nearest_route(self, flow_field):
+        """
+        Route from the tile the enemy stands on or, if that tile became impassable, from the
+        neighbouring tile closest to the finish. Empty if neither has a route.
+        """
+        current_tile = self.map.get_tile_pos_at_position(*self.center)
+        if current_tile is None:
+            return ()
+        route = flow_field.path_from(current_tile)
+        if route:
+            return route
+        x, y = current_tile
+        neighbors = [tile for tile in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)) if tile in flow_field.distance]
+        if not neighbors:
+            return ()
+        return flow_field.path_from(min(neighbors, key=flow_field.distance.get))
+
+    def set_next_target(self):
+        """Set the next position along the path for the enemy to move towards."""
+        if self.current_path_index < len(self.path):
+            next_tile = self.path[self.current_path_index]
+            self.current_target = self.map.get_tile_center(next_tile)
+            self.current_path_index += 1
+        else:
+            # Enemy reached the goal
+            self.leak()
+
+    def leak(self):
+        """Leave the map as an enemy that got through: costs the player one hp."""
+        self.map.hp -= 1
+        self.map.enemies_missed += 1
+        self.kill()
+
+    def move(self):
+        """Move enemy toward current target tile and turn to face it."""
+        if not self.current_target:
+            return
+
+        # Direction vector to target
+        dx = self.current_target[0] - self.center[0]
+        dy = self.current_target[1] - self.center[1]
+        distance = math.hypot(dx, dy)
+        if distance != 0:
+            dx /= distance
+            dy /= distance
+
+        # Get current tile and calculate terrain effect (speed is inversely proportional to tile cost)
+        current_tile = self.path[self.current_path_index - 1]
+        movement_multiplier = 1.0 / self.map.get_movement_cost(current_tile, self.enemy_type)
+        step = self.speed * movement_multiplier
+
+        # Face direction of travel and move
+        self.angle = math.degrees(math.atan2(-dy, dx))
+        self.center = (self.center[0] + dx * step, self.center[1] + dy * step)
+
+        # If close enough to the target tile, snap to center and advance
+        if math.dist(self.center, self.current_target) < self.speed:
+            self.center = self.current_target
+            self.set_next_target()
+
+        if self.active:
+            self.map.enemy_grid.move(self, self.center)
+
+    def kill(self):
+        """Remove enemy from the map's spatial index and every group holding it."""
+        self.active = False
+        self.map.enemy_grid.remove(self)
+        for group in list(self.unit_groups):
+            group.remove(self)
+
+    def update(self):
+        """Update enemy each tick: move and handle death."""
+        self.move()
+        if self.active and self.hp <= 0:
+            self.map.enemies_killed += 1
+            self.map.money += cs.KILL_REWARD
+            self.kill()
+
+
+class TurretUnit:
+    """
+    Turret game logic without graphics: stats, targeting, line of sight, firing and upgrades.
+    The pygame Turret sprite adds its image and range overlay on top.
+    """
+    def __init__(self, pos, tower_type, tile_pos=None, turret_data=TURRET_DATA):
+        # Basic attributes
+        self.tower_type = tower_type
+        self.center = pos  # Position in pixels
+        self.turret_data = turret_data
+
+        self.upgrade_turret = 1  # Track turret upgrade level
+
+        # Load stats from turret data
+        self.range = turret_data[self.tower_type]["range"]
+        self.attack_speed = turret_data[self.tower_type]["attack_speed"]
+        self.damage = turret_data[self.tower_type]["damage"]
+
+        self.tile_pos = tile_pos  # Grid position on map
+        self.map = None  # Map whose turret grid holds this turret, set by MapState.place_turret
+
+        self.target = None
+        self.angle = 0.0  # Facing in degrees
+        self.last_fire_time = float('-inf')  # Simulation time of last attack (never fired yet)
+        self.unit_groups = set()  # UnitGroups holding this turret
+
+    def delete_turret(self):
+        """Remove turret from game."""
+        self.kill()
+
+    def kill(self):
+        """Free the turret's map tile and remove it from every group holding it."""
+        if self.map is not None:
+            self.map.remove_turret(self)
+            self.map = None
+        for group in list(self.unit_groups):
+            group.remove(self)
+
+    def check_line_of_sight(self, map_obj, enemy):
+        """Check if a clear line to the enemy exists (not blocked by mountain tiles) using the map's precomputed visibility."""
+        turret_tile = (int(self.center[0] // map_obj.tile_size), int(self.center[1] // map_obj.tile_size))
+        enemy_tile = (int(enemy.center[0] // map_obj.tile_size), int(enemy.center[1] // map_obj.tile_size))
+        return map_obj.has_line_of_sight(turret_tile, enemy_tile)
+
+    def find_target(self, enemy_group, enemy_grid=None):
+        """
+        Choose enemy within range that is farthest along the path (earliest spawned on ties).
+        If the map's spatial index is given, only enemies in nearby tiles are checked.
+        """
+        candidates = enemy_grid.query_circle(self.center, self.range) if enemy_grid else enemy_group
+        closest_enemy = None
+        for enemy in candidates:
+            if enemy.hp > 0:
+                distance = math.dist(enemy.center, self.center)
+                if distance <= self.range:
+                    if (closest_enemy is None
+                            or enemy.current_path_index > closest_enemy.current_path_index
+                            or (enemy.current_path_index == closest_enemy.current_path_index
+                                and enemy.spawn_order < closest_enemy.spawn_order)):
+                        closest_enemy = enemy
+        return closest_enemy
+
+    def calculate_rotation_angle(self, target):
+        """Compute rotation angle in degrees to face the target."""
+        dx = target.center[0] - self.center[0]
+        dy = target.center[1] - self.center[1]
+        return math.degrees(math.atan2(-dy, dx)) - 90
+
+    def update(self, enemy_group, current_time, enemy_grid=None):
+        """Handle turret firing logic: targeting, line of sight, and damage at the given simulation time."""
+        # Check cooldown
+        if not self.ready_to_fire(current_time):
+            return
+
+        # Find new target and shoot it
+        self.engage(self.find_target(enemy_group, enemy_grid), current_time)
+
+    def ready_to_fire(self, current_time):
+        """Return True if the attack cooldown has passed."""
+        return current_time - self.last_fire_time >= self.attack_speed
+
+    def engage(self, target, current_time):
+        """Face and shoot the chosen target if it is in line of sight."""
+        self.target = target
+        if not self.target or not self.check_line_of_sight(self.target.map, self.target):
+            return
+
+        # Rotate to face target
+        self.angle = self.calculate_rotation_angle(self.target)
+
+        # Fire
+        self.target.hp -= self.damage
+        self.last_fire_time = current_time
+        self.on_hit(self.target)
+
+    def on_hit(self, target):
+        """Called after every shot that hits; the pygame Turret uses it to update visuals and log."""
+        pass
+
+    def upgrade(self):
+        """Upgrade turret stats."""
+        self.upgrade_turret += 1
+        self.tower_type = f"{self.tower_type}_upgrade"
+
+        # Update stats from data
+        self.range = self.turret_data[self.tower_type]["range"]
+        self.attack_speed = self.turret_data[self.tower_type]["attack_speed"]
+        self.damage = self.turret_data[self.tower_type]["damage"]